@@ -1,19 +1,149 @@
-from typing import Any, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
 import os
 import json
+import struct
+import time
+import zlib
 
 try:
     import redis.asyncio as redis  # type: ignore
 except Exception:  # pragma: no cover
     redis = None  # type: ignore
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover
+    zstandard = None  # type: ignore
+
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1024"))
+# How long a value read from Redis is also kept in this process; bounds cross-process staleness
+LOCAL_CACHE_TTL_SECONDS = float(os.getenv("LOCAL_CACHE_TTL_SECONDS", "30"))
+# Encoded values at least this large are compressed (zstd when available, else zlib)
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "2048"))
+
+# Stored entries are <magic><version><flags><fresh_until: float64, 0 = unset><body>.
+# Anything without the magic is a legacy plain-JSON entry.
+CODEC_MAGIC = b"\xa7J"
+CODEC_VERSION = 1
+_HEADER = struct.Struct("!2sBBd")
+FLAG_ZLIB = 1
+FLAG_ZSTD = 2
+FLAG_BYTES = 4  # body is an opaque bytes value (e.g. a pre-rendered response), not JSON
+
+
+def dumps_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_entry(value: Any, fresh_until: Optional[float] = None) -> bytes:
+    """Encode a cache value (JSON-able, or ``bytes`` stored verbatim) for Redis."""
+    flags = 0
+    if isinstance(value, (bytes, bytearray)):
+        body = bytes(value)
+        flags |= FLAG_BYTES
+    else:
+        body = dumps_json(value)
+    if len(body) >= CACHE_COMPRESS_MIN_BYTES:
+        if zstandard is not None:
+            body = zstandard.ZstdCompressor(level=3).compress(body)
+            flags |= FLAG_ZSTD
+        else:
+            body = zlib.compress(body, 1)
+            flags |= FLAG_ZLIB
+    return _HEADER.pack(CODEC_MAGIC, CODEC_VERSION, flags, fresh_until or 0.0) + body
+
+
+def decode_entry(raw: bytes) -> Tuple[Any, Optional[float]]:
+    """Inverse of ``encode_entry``: ``(value, fresh_until)``. Also reads legacy JSON text entries."""
+    if not raw.startswith(CODEC_MAGIC):
+        value = json.loads(raw)
+        if isinstance(value, dict) and "fresh_until" in value and "value" in value:
+            return value["value"], value["fresh_until"]
+        return value, None
+
+    _, version, flags, fresh_until = _HEADER.unpack_from(raw)
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unknown cache entry version {version}")
+    body = raw[_HEADER.size:]
+    if flags & FLAG_ZSTD:
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+    value = body if flags & FLAG_BYTES else loads_json(body)
+    return value, (fresh_until or None)
+
+
+class LocalCache:
+    """Bounded in-process LRU whose entries expire after their own TTL.
+
+    Values are handed out as-is, not copied, so callers must not mutate them.
+    """
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _stats(app) -> Dict[str, int]:
+    stats = getattr(app.state, "cache_stats", None)
+    if stats is None:
+        stats = {
+            "local_hits": 0, "redis_hits": 0, "misses": 0, "coalesced": 0,
+            "stale_hits": 0, "refreshes": 0, "refresh_errors": 0,
+        }
+        app.state.cache_stats = stats
+    return stats
+
+
+def _inflight(app) -> Dict[str, asyncio.Future]:
+    inflight = getattr(app.state, "cache_inflight", None)
+    if inflight is None:
+        inflight = {}
+        app.state.cache_inflight = inflight
+    return inflight
+
 
 async def init_redis(app) -> None:
     if redis is None:
         app.state.redis = None
         return
     url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-    client = redis.from_url(url, decode_responses=True)
+    client = redis.from_url(url, decode_responses=False)
     try:
         await client.ping()
     except Exception:
@@ -31,29 +161,271 @@ async def close_redis(app) -> None:
             pass
 
 
-async def get_cache(app, key: str) -> Optional[Any]:
+async def init_cache(app) -> None:
+    """Set up both tiers: the local LRU always, Redis when it is reachable."""
+    app.state.local_cache = LocalCache()
+    await init_redis(app)
+
+
+async def close_cache(app) -> None:
+    await close_redis(app)
+    app.state.local_cache = None
+
+
+async def _get_entry(app, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+    stats = _stats(app)
+    local = getattr(app.state, "local_cache", None)
+    if local is not None:
+        entry = local.get(key)
+        if entry is not None:
+            stats["local_hits"] += 1
+            return entry
+
     client = getattr(app.state, "redis", None)
-    if client is None:
+    entry = None
+    if client is not None:
+        try:
+            raw = await client.get(key)
+            entry = decode_entry(raw) if raw else None
+        except Exception:
+            entry = None
+    if entry is None or entry[0] is None:
+        stats["misses"] += 1
         return None
+    stats["redis_hits"] += 1
+    if local is not None:
+        local.set(key, entry, LOCAL_CACHE_TTL_SECONDS)
+    return entry
+
+
+def _local_ttl(app, ttl_seconds: float) -> float:
+    # With Redis shared by several processes, this process's own writes are held
+    # locally no longer than what it reads from Redis, so a refresh written by
+    # another process is picked up instead of each one refreshing its own copy
+    if getattr(app.state, "redis", None) is None:
+        return ttl_seconds
+    return min(ttl_seconds, LOCAL_CACHE_TTL_SECONDS)
+
+
+async def _set_entry(app, key: str, value: Any, ttl_seconds: int, fresh_until: Optional[float] = None) -> None:
+    local = getattr(app.state, "local_cache", None)
+    if local is not None:
+        local.set(key, (value, fresh_until), _local_ttl(app, ttl_seconds))
+    client = getattr(app.state, "redis", None)
+    if client is None:
+        return
     try:
-        raw = await client.get(key)
-        return json.loads(raw) if raw else None
+        await client.set(key, encode_entry(value, fresh_until), ex=ttl_seconds)
     except Exception:
-        return None
+        return
+
+
+async def get_cache(app, key: str) -> Optional[Any]:
+    entry = await _get_entry(app, key)
+    return entry[0] if entry is not None else None
 
 
 async def set_cache(app, key: str, value: Any, ttl_seconds: int = 300) -> None:
+    await _set_entry(app, key, value, ttl_seconds)
+
+
+async def _get_entries(app, keys) -> Dict[str, Tuple[Any, Optional[float]]]:
+    stats = _stats(app)
+    found: Dict[str, Tuple[Any, Optional[float]]] = {}
+    local = getattr(app.state, "local_cache", None)
+    unique = list(dict.fromkeys(keys))
+    missing = []
+    for key in unique:
+        entry = local.get(key) if local is not None else None
+        if entry is not None:
+            found[key] = entry
+        else:
+            missing.append(key)
+    stats["local_hits"] += len(found)
+
+    client = getattr(app.state, "redis", None)
+    if client is not None and missing:
+        try:
+            raws = await client.mget(missing)
+        except Exception:
+            raws = [None] * len(missing)
+        for key, raw in zip(missing, raws):
+            try:
+                entry = decode_entry(raw) if raw else None
+            except Exception:
+                entry = None
+            if entry is None or entry[0] is None:
+                continue
+            found[key] = entry
+            stats["redis_hits"] += 1
+            if local is not None:
+                local.set(key, entry, LOCAL_CACHE_TTL_SECONDS)
+    stats["misses"] += len(unique) - len(found)
+    return found
+
+
+async def get_many(app, keys) -> Dict[str, Any]:
+    """Look up many keys at once: local tier first, then one Redis ``MGET`` for the rest.
+
+    Returns only the keys that were found.
+    """
+    return {key: value for key, (value, _) in (await _get_entries(app, keys)).items()}
+
+
+async def set_many(app, items: Dict[str, Any], ttl_seconds: int = 300) -> None:
+    """Store many values with one TTL, in a single pipelined Redis round trip."""
+    if not items:
+        return
+    local = getattr(app.state, "local_cache", None)
+    if local is not None:
+        local_ttl = _local_ttl(app, ttl_seconds)
+        for key, value in items.items():
+            local.set(key, (value, None), local_ttl)
     client = getattr(app.state, "redis", None)
     if client is None:
         return
     try:
-        await client.set(key, json.dumps(value), ex=ttl_seconds)
+        pipe = client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, encode_entry(value), ex=ttl_seconds)
+        await pipe.execute()
     except Exception:
         return
 
 
+def _waiters(app) -> Dict[str, int]:
+    waiters = getattr(app.state, "cache_waiters", None)
+    if waiters is None:
+        waiters = {}
+        app.state.cache_waiters = waiters
+    return waiters
+
+
+def _start_build(app, key: str, build, ttl_seconds: int, fresh_seconds: float, cacheable, encode) -> asyncio.Future:
+    inflight = _inflight(app)
+    task = inflight.get(key)
+    if task is not None:
+        return task
+
+    async def _build():
+        result = await build()
+        store = cacheable(result)
+        if encode is not None:
+            result = encode(result)
+        if store:
+            await _set_entry(app, key, result, ttl_seconds, fresh_until=time.time() + fresh_seconds)
+        return result
+
+    task = asyncio.ensure_future(_build())
+    inflight[key] = task
+    task.add_done_callback(lambda _: inflight.pop(key, None))
+    return task
+
+
+def _refreshed(app):
+    def _done(task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None:
+            # The stale value stays in place until the hard TTL; the next stale hit tries again
+            _stats(app)["refresh_errors"] += 1
+    return _done
+
+
+async def get_or_build(
+    app,
+    key: str,
+    build: Callable[[], Awaitable[Any]],
+    ttl_seconds: int = 300,
+    cacheable: Callable[[Any], bool] = lambda value: True,
+    fresh_seconds: Optional[float] = None,
+    encode: Optional[Callable[[Any], bytes]] = None,
+    lookup: bool = True,
+) -> Any:
+    """Return the cached value for ``key``, or build it once however many callers miss.
+
+    Entries are served as-is for ``fresh_seconds`` (the soft TTL, default
+    ``ttl_seconds``). After that and until ``ttl_seconds`` (the hard TTL, when the
+    entry expires) the stale value is still returned at once while one background
+    ``build()`` refreshes it. Only callers that find nothing at all wait.
+
+    Concurrent misses and refreshes on the same key share one ``build()``
+    (single-flight); the result is cached when ``cacheable(result)`` holds. The
+    build runs as its own task, so a caller that is cancelled does not cancel it
+    for the others; once every waiting caller has been cancelled the build is
+    cancelled too (and nothing is cached). Background refreshes always finish.
+
+    With ``encode`` (e.g. ``dumps_json``) the built value is encoded once and the
+    bytes are what gets cached and returned, so hits can be sent as a response
+    body without decoding and re-encoding.
+
+    Pass ``lookup=False`` when the caller already found the key missing (e.g.
+    through ``get_many``) to go straight to the shared build.
+    """
+    fresh_seconds = ttl_seconds if fresh_seconds is None else min(fresh_seconds, ttl_seconds)
+    stats = _stats(app)
+
+    entry = await _get_entry(app, key) if lookup else None
+    if entry is not None:
+        value, fresh_until = entry
+        if fresh_until is not None and fresh_until > time.time():
+            return value
+        # Stale (or written without a soft TTL): serve it, refresh behind
+        stats["stale_hits"] += 1
+        if key not in _inflight(app):
+            stats["refreshes"] += 1
+            task = _start_build(app, key, build, ttl_seconds, fresh_seconds, cacheable, encode)
+            task.add_done_callback(_refreshed(app))
+            # Nobody waits on a refresh; count it as a waiter so it is never cancelled
+            _wait(app, key, task)
+        return value
+
+    if key in _inflight(app):
+        stats["coalesced"] += 1
+    task = _start_build(app, key, build, ttl_seconds, fresh_seconds, cacheable, encode)
+    release = _wait(app, key, task)
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if release() == 0:
+            # The last caller gave up: stop the build rather than let it run unobserved
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        raise
+    finally:
+        release()
+
+
+def _wait(app, key: str, task: asyncio.Future) -> Callable[[], int]:
+    """Count a waiter on ``key``'s build until ``task`` is done or the returned release is called.
+
+    Release is idempotent and returns how many waiters remain.
+    """
+    waiters = _waiters(app)
+    waiters[key] = waiters.get(key, 0) + 1
+    released = False
+
+    def _release(_=None) -> int:
+        nonlocal released
+        if not released:
+            released = True
+            waiters[key] -= 1
+            if waiters[key] == 0:
+                del waiters[key]
+        return waiters.get(key, 0)
+
+    task.add_done_callback(_release)
+    return _release
+
+
+def cache_stats(app) -> Dict[str, Any]:
+    local = getattr(app.state, "local_cache", None)
+    return {
+        **_stats(app),
+        "local_entries": len(local) if local is not None else 0,
+        "in_flight": len(_inflight(app)),
+        "redis": getattr(app.state, "redis", None) is not None,
+    }
+
+
 def build_cache_key(prefix: str, **parts: Any) -> str:
     stable = ":".join(f"{k}={parts[k]}" for k in sorted(parts.keys()))
     return f"{prefix}:{stable}"
-
-
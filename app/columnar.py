@@ -0,0 +1,114 @@
+import os
+from datetime import datetime
+from typing import AsyncIterator, List
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+from app.crud import job_filters, iter_job_chunks
+
+# Rows per record batch (and Parquet row group); large enough for good compression
+COLUMNAR_CHUNK_ROWS = int(os.getenv("COLUMNAR_CHUNK_ROWS", "65536"))
+
+class ColumnarUnavailable(Exception):
+    """pyarrow is not installed, so there is no columnar export."""
+
+
+FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def job_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("company", pa.string()),
+        ("location", pa.string()),
+        ("description", pa.string()),
+        ("url", pa.string()),
+        ("source", pa.string()),
+        ("liked", pa.bool_()),
+        ("applied", pa.bool_()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+class _DrainSink:
+    """Write-only file object the Arrow writers fill; ``drain`` hands back what's new.
+
+    ``tell`` keeps counting across drains, which Parquet needs for its footer offsets.
+    """
+
+    def __init__(self) -> None:
+        self.parts: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+async def stream_jobs_columnar(
+    format: str = "parquet",
+    source: str = None,
+    liked: bool = None,
+    applied: bool = None,
+    created_after: datetime = None,
+    created_before: datetime = None,
+    chunk_rows: int = None,
+) -> AsyncIterator[bytes]:
+    """Yield the jobs table as Parquet or an Arrow IPC stream, one record batch per DB chunk.
+
+    Filters match ``get_saved_jobs``. Each cursor chunk becomes a record batch (a
+    Parquet row group) and its bytes are yielded straight away, so memory stays
+    bounded by one chunk.
+    """
+    if pa is None:
+        raise ColumnarUnavailable("Columnar export requires pyarrow")
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+
+    chunk_rows = chunk_rows or COLUMNAR_CHUNK_ROWS
+    filters = job_filters(
+        source=source, liked=liked, applied=applied, created_after=created_after, created_before=created_before
+    )
+    schema = job_schema()
+    sink = _DrainSink()
+    if format == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    async for rows in iter_job_chunks(filters, chunk_rows):
+        columns = list(zip(*rows))
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+        )
+        writer.write_batch(batch)
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
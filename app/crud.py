@@ -1,21 +1,107 @@
 
-from app.models import Job
-from app.db import AsyncSessionLocal
+from app.models import Job, SavedSearch, ScrapeTask
+from app.db import AsyncSessionLocal, engine
+from app.normalize import normalize_url
+from app.search import apply_search
+from app.seen import mark_seen
+from sqlalchemy import and_, func, or_, update
 from sqlalchemy.future import select
+from sqlalchemy.orm import with_expression
+import base64
 import csv
 import io
-from datetime import datetime
+import json
+import os
+from datetime import datetime, timedelta
+
+BULK_BATCH_SIZE = 500
+# Columns a re-save may refresh; liked/applied only ever turn on, created_at is kept
+UPSERT_COLUMNS = ("title", "company", "location", "description", "url", "source")
+JOB_COLUMNS = ("title", "company", "location", "description", "url", "source", "liked", "applied")
+
+
+def _insert_for(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise Exception(f"Bulk upsert is not supported on {dialect}")
+    return insert
+
+
+async def save_jobs_bulk(jobs: list):
+    """Insert or update many jobs, keyed by normalized URL, in batched statements.
+
+    Each batch is one ``INSERT ... ON CONFLICT (url_key) DO UPDATE ... RETURNING``
+    and the whole call is one transaction. Jobs without a URL have no key (NULL
+    never conflicts) and are always inserted as new rows. Returns the job ids in
+    input order (repeated URLs share an id) with counts of newly inserted and
+    updated jobs.
+    """
+    # Every row in the call gets the same created_at; an update keeps the stored
+    # one, so RETURNING created_at tells inserts from updates without another query
+    saved_at = datetime.utcnow()
+    rows = {}
+    unkeyed = []
+    keys = []
+    for job_data in jobs:
+        row = {column: job_data[column] for column in JOB_COLUMNS if column in job_data}
+        key = normalize_url(row.get("url", "")) or None
+        row["url_key"] = key
+        row["created_at"] = saved_at
+        keys.append(key)
+        if key is None:
+            unkeyed.append(row)
+        else:
+            # Postgres refuses to touch the same row twice in one statement; last one wins
+            rows[key] = row
 
-async def save_job(job_data: dict):
     try:
         async with AsyncSessionLocal() as session:
-            job = Job(**job_data)
-            session.add(job)
+            insert = _insert_for(_dialect_name(session))
+            ids = {}
+            inserted = 0
+            unique_rows = list(rows.values())
+            for start in range(0, len(unique_rows), BULK_BATCH_SIZE):
+                stmt = insert(Job).values(unique_rows[start:start + BULK_BATCH_SIZE])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Job.url_key],
+                    set_={
+                        **{column: getattr(stmt.excluded, column) for column in UPSERT_COLUMNS},
+                        "liked": or_(Job.liked, stmt.excluded.liked),
+                        "applied": or_(Job.applied, stmt.excluded.applied),
+                    },
+                ).returning(Job.id, Job.url_key, Job.created_at)
+                result = await session.execute(stmt)
+                for job_id, url_key, created_at in result.all():
+                    ids[url_key] = job_id
+                    inserted += created_at == saved_at
+
+            unkeyed_ids = []
+            for start in range(0, len(unkeyed), BULK_BATCH_SIZE):
+                result = await session.execute(
+                    insert(Job).returning(Job.id, sort_by_parameter_order=True),
+                    unkeyed[start:start + BULK_BATCH_SIZE],
+                )
+                unkeyed_ids += result.scalars().all()
             await session.commit()
-            await session.refresh(job)
-        return {"message": "Job saved successfully", "job_id": job.id}
     except Exception as e:
         raise Exception(f"Database error: {str(e)}")
+    mark_seen(ids.keys())
+
+    new_ids = iter(unkeyed_ids)
+    return {
+        "message": f"Saved {len(rows) + len(unkeyed)} jobs",
+        "job_ids": [ids[key] if key is not None else next(new_ids) for key in keys],
+        "inserted": inserted + len(unkeyed),
+        "updated": len(rows) - inserted,
+    }
+
+
+async def save_job(job_data: dict):
+    result = await save_jobs_bulk([job_data])
+    return {"message": "Job saved successfully", "job_id": result["job_ids"][0]}
 
 async def update_job_status(job_id: int, liked: bool = None, applied: bool = None, title: str = None):
     try:
@@ -47,6 +133,60 @@ async def update_job_status(job_id: int, liked: bool = None, applied: bool = Non
     except Exception as e:
         raise Exception(f"Update failed: {str(e)}")
 
+def _dialect_name(session) -> str:
+    bind = getattr(session, "bind", None)
+    return (bind or engine).dialect.name
+
+
+def encode_cursor(created_at: datetime, job_id: int, rank: float = None) -> str:
+    position = [created_at.isoformat() if created_at else None, job_id]
+    if rank is not None:
+        position.append(rank)
+    raw = json.dumps(position)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Inverse of ``encode_cursor``: ``(created_at, job_id, rank)``, ``rank`` being None for plain pages."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, job_id, *rank = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if len(rank) > 1:
+            raise ValueError
+        created_at = datetime.fromisoformat(created_at) if created_at else None
+        return created_at, int(job_id), (float(rank[0]) if rank else None)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def job_filters(
+    company: str = None,
+    location: str = None,
+    source: str = None,
+    liked: bool = None,
+    applied: bool = None,
+    created_after: datetime = None,
+    created_before: datetime = None,
+):
+    filters = []
+    if company:
+        filters.append(Job.company.ilike(f"%{company}%"))
+    if location:
+        filters.append(Job.location.ilike(f"%{location}%"))
+    if source:
+        # Sources are a fixed set; case-insensitive equality can use ix_jobs_source_created_at
+        filters.append(func.lower(Job.source) == source.strip().lower())
+    if liked is not None:
+        filters.append(Job.liked == liked)
+    if applied is not None:
+        filters.append(Job.applied == applied)
+    if created_after is not None:
+        filters.append(Job.created_at >= created_after)
+    if created_before is not None:
+        filters.append(Job.created_at < created_before)
+    return filters
+
+
 async def get_saved_jobs(
     search: str = None,
     company: str = None,
@@ -55,108 +195,344 @@ async def get_saved_jobs(
     liked: bool = None,
     applied: bool = None,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: str = None,
+    created_after: datetime = None,
+    created_before: datetime = None,
 ):
+    """List saved jobs newest first.
+
+    Without ``cursor`` this pages by ``offset`` and reports ``total`` from a
+    ``COUNT(*)``. With ``cursor`` (the ``next_cursor`` of a previous page) it seeks
+    past ``(created_at, id)`` instead, so deep pages cost the same as the first;
+    ``total`` is not computed in that mode.
+
+    ``search`` goes through the full-text index (see ``app.search``) and orders by
+    relevance, then recency; its cursors carry the rank too and seek past
+    ``(rank, created_at, id)``, so both paging modes walk the same order.
+    """
+    filters = job_filters(company, location, source, liked, applied, created_after, created_before)
+    position = decode_cursor(cursor) if cursor else None
+
     async with AsyncSessionLocal() as session:
-        query = select(Job)
-        
-        if search:
-            search_filter = (
-                Job.title.ilike(f"%{search}%") |
-                Job.company.ilike(f"%{search}%") |
-                Job.description.ilike(f"%{search}%")
+        dialect = _dialect_name(session)
+        query, rank = apply_search(select(Job).where(*filters), dialect, search)
+        if position is not None and (position[2] is None) != (rank is None):
+            # A cursor from a relevance-ordered page used without the search, or the other way round
+            raise ValueError("Invalid cursor")
+        if rank is not None:
+            query = query.options(with_expression(Job.search_rank, rank)).order_by(rank.desc())
+        query = query.order_by(Job.created_at.desc(), Job.id.desc())
+
+        if position is not None:
+            created_at, job_id, last_rank = position
+            after = or_(
+                Job.created_at < created_at,
+                and_(Job.created_at == created_at, Job.id < job_id),
             )
-            query = query.where(search_filter)
-        
-        if company:
-            query = query.where(Job.company.ilike(f"%{company}%"))
-        
-        if location:
-            query = query.where(Job.location.ilike(f"%{location}%"))
-        
-        if source:
-            query = query.where(Job.source.ilike(f"%{source}%"))
-        
-        if liked is not None:
-            query = query.where(Job.liked == liked)
-        
-        if applied is not None:
-            query = query.where(Job.applied == applied)
-        
-        query = query.order_by(Job.created_at.desc()).offset(offset).limit(limit)
-        
-        result = await session.execute(query)
-        jobs = result.scalars().all()
-        
-        count_query = select(Job)
-        if search:
-            count_query = count_query.where(search_filter)
-        if company:
-            count_query = count_query.where(Job.company.ilike(f"%{company}%"))
-        if location:
-            count_query = count_query.where(Job.location.ilike(f"%{location}%"))
-        if source:
-            count_query = count_query.where(Job.source.ilike(f"%{source}%"))
-        if liked is not None:
-            count_query = count_query.where(Job.liked == liked)
-        if applied is not None:
-            count_query = count_query.where(Job.applied == applied)
-        
-        count_result = await session.execute(count_query)
-        total_count = len(count_result.scalars().all())
-        
+            if rank is not None:
+                after = or_(rank < last_rank, and_(rank == last_rank, after))
+            query = query.where(after)
+        else:
+            query = query.offset(offset)
+
+        # One extra row tells us whether another page exists
+        result = await session.execute(query.limit(limit + 1))
+        rows = result.scalars().all()
+        jobs, has_next = rows[:limit], len(rows) > limit
+
+        total_count = None
+        if position is None:
+            count_query, _ = apply_search(select(func.count()).select_from(Job).where(*filters), dialect, search)
+            count_result = await session.execute(count_query)
+            total_count = count_result.scalar_one()
+
+        last = jobs[-1] if jobs else None
+        next_cursor = None
+        if has_next and last is not None:
+            next_cursor = encode_cursor(last.created_at, last.id, last.search_rank if rank is not None else None)
         return {
             "jobs": [job.__dict__ for job in jobs],
             "pagination": {
                 "total": total_count,
                 "limit": limit,
-                "offset": offset,
-                "has_next": (offset + limit) < total_count,
-                "has_prev": offset > 0
+                "offset": offset if position is None else None,
+                "has_next": has_next,
+                "has_prev": position is not None or offset > 0,
+                "next_cursor": next_cursor,
             }
         }
     
-async def export_applied_jobs():
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "500"))
+EXPORT_FIELDS = ["ID", "Title", "Company", "Location", "Description", "URL", "Source", "Liked", "Applied", "Created At"]
+
+
+def _export_row(job) -> dict:
+    return {
+        "ID": job.id,
+        "Title": job.title,
+        "Company": job.company,
+        "Location": job.location,
+        "Description": job.description or "",
+        "URL": job.url,
+        "Source": job.source,
+        "Liked": "Yes" if job.liked else "No",
+        "Applied": "Yes" if job.applied else "No",
+        "Created At": job.created_at.strftime("%Y-%m-%d %H:%M:%S") if job.created_at else ""
+    }
+
+
+EXPORT_COLUMNS = (
+    Job.id, Job.title, Job.company, Job.location, Job.description,
+    Job.url, Job.source, Job.liked, Job.applied, Job.created_at,
+)
+
+
+async def iter_job_chunks(filters, chunk_rows: int):
+    """Yield lists of up to ``chunk_rows`` job rows (newest first) from a server-side cursor."""
+    async with AsyncSessionLocal() as session:
+        # Plain column rows rather than ORM objects: nothing accumulates in the session
+        result = await session.stream(
+            select(*EXPORT_COLUMNS)
+            .where(*filters)
+            .order_by(Job.created_at.desc())
+            .execution_options(yield_per=chunk_rows)
+        )
+        async for jobs in result.partitions(chunk_rows):
+            yield jobs
+
+
+async def stream_applied_jobs(format: str = "csv", chunk_rows: int = None):
+    """Yield the applied-jobs export as encoded chunks of ``chunk_rows`` rows.
+
+    Rows come from a server-side cursor and each chunk is encoded on its own, so
+    memory stays flat however many jobs are exported. ``format`` is ``csv`` (header
+    in the first chunk) or ``ndjson``. Yields nothing when there are no applied jobs.
+    """
+    chunk_rows = chunk_rows or EXPORT_CHUNK_ROWS
+    header_written = False
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
     try:
-        async with AsyncSessionLocal() as session:
+        async for jobs in iter_job_chunks([Job.applied == True], chunk_rows):
+            if format == "ndjson":
+                yield "".join(json.dumps(_export_row(job)) + "\n" for job in jobs).encode("utf-8")
+                continue
+            if not header_written:
+                writer.writeheader()
+                header_written = True
+            writer.writerows(_export_row(job) for job in jobs)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    except Exception as e:
+        raise Exception(f"Export failed: {str(e)}")
+
+
+# A running task whose worker has not finished it within the lease is handed out again
+TASK_LEASE_SECONDS = int(os.getenv("TASK_LEASE_SECONDS", "900"))
+TASK_MAX_ATTEMPTS = int(os.getenv("TASK_MAX_ATTEMPTS", "3"))
+
+
+def _task_dict(task: ScrapeTask) -> dict:
+    return {
+        "task_id": task.id,
+        "status": task.status,
+        "query": task.query,
+        "location": task.location,
+        "sources": task.sources.split(","),
+        "limit": task.per_source_limit,
+        "saved_search_id": task.saved_search_id,
+        "attempts": task.attempts,
+        "result": task.result,
+        "error": task.error,
+        "created_at": task.created_at,
+        "started_at": task.started_at,
+        "finished_at": task.finished_at,
+    }
+
+
+def _search_dict(search: SavedSearch) -> dict:
+    return {
+        "id": search.id,
+        "query": search.query,
+        "location": search.location,
+        "sources": search.sources.split(","),
+        "limit": search.per_source_limit,
+        "interval_minutes": search.interval_minutes,
+        "enabled": search.enabled,
+        "next_run_at": search.next_run_at,
+        "last_run_at": search.last_run_at,
+    }
+
+
+async def enqueue_scrape(query: str, location: str, sources: list, limit: int = 10, saved_search_id: int = None):
+    async with AsyncSessionLocal() as session:
+        task = ScrapeTask(
+            query=query,
+            location=location,
+            sources=",".join(sources),
+            per_source_limit=limit,
+            saved_search_id=saved_search_id,
+            status="queued",
+            attempts=0,
+        )
+        session.add(task)
+        await session.commit()
+        return _task_dict(task)
+
+
+async def get_task(task_id: int):
+    async with AsyncSessionLocal() as session:
+        task = await session.get(ScrapeTask, task_id)
+        return _task_dict(task) if task is not None else None
+
+
+async def claim_tasks(count: int, now: datetime = None):
+    """Mark up to ``count`` queued (or lease-expired) tasks as running and return them.
+
+    On Postgres candidates are read ``FOR UPDATE SKIP LOCKED`` so concurrent
+    workers pick different rows; everywhere the claim itself only succeeds if
+    the row is unchanged since it was read, so a task is never handed out twice.
+    A lease-expired task that has used up its ``TASK_MAX_ATTEMPTS`` (its worker
+    crashed on every attempt) is marked failed instead of being run again.
+    """
+    now = now or datetime.utcnow()
+    expired = now - timedelta(seconds=TASK_LEASE_SECONDS)
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(ScrapeTask)
+            .where(
+                ScrapeTask.status == "running",
+                ScrapeTask.started_at < expired,
+                ScrapeTask.attempts >= TASK_MAX_ATTEMPTS,
+            )
+            .values(status="failed", error="Lease expired on the last attempt", finished_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        query = (
+            select(ScrapeTask.id, ScrapeTask.attempts)
+            .where(or_(
+                ScrapeTask.status == "queued",
+                and_(
+                    ScrapeTask.status == "running",
+                    ScrapeTask.started_at < expired,
+                    ScrapeTask.attempts < TASK_MAX_ATTEMPTS,
+                ),
+            ))
+            .order_by(ScrapeTask.created_at, ScrapeTask.id)
+            .limit(count)
+        )
+        if _dialect_name(session) == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        candidates = (await session.execute(query)).all()
+
+        claimed = []
+        for task_id, attempts in candidates:
             result = await session.execute(
-                select(Job).where(Job.applied == True).order_by(Job.created_at.desc())
+                update(ScrapeTask)
+                .where(ScrapeTask.id == task_id, ScrapeTask.attempts == attempts)
+                .values(status="running", attempts=attempts + 1, started_at=now)
             )
-            jobs = result.scalars().all()
-            
-            if not jobs:
-                return {"message": "No applied jobs found", "csv_data": ""}
-            
-            job_list = []
-            for job in jobs:
-                job_dict = {
-                    "ID": job.id,
-                    "Title": job.title,
-                    "Company": job.company,
-                    "Location": job.location,
-                    "Description": job.description or "",
-                    "URL": job.url,
-                    "Source": job.source,
-                    "Liked": "Yes" if job.liked else "No",
-                    "Applied": "Yes" if job.applied else "No",
-                    "Created At": job.created_at.strftime("%Y-%m-%d %H:%M:%S") if job.created_at else ""
-                }
-                job_list.append(job_dict)
-            
-            output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=job_list[0].keys())
-            writer.writeheader()
-            writer.writerows(job_list)
-            
-            csv_content = output.getvalue()
-            output.close()
-            
-            return {
-                "message": f"Successfully exported {len(jobs)} applied jobs",
-                "csv_data": csv_content,
-                "job_count": len(jobs),
-                "filename": f"applied_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            }
-            
-    except Exception as e:
-        raise Exception(f"Export failed: {str(e)}")
\ No newline at end of file
+            if result.rowcount == 1:
+                claimed.append(task_id)
+        await session.commit()
+
+        if not claimed:
+            return []
+        tasks = await session.execute(select(ScrapeTask).where(ScrapeTask.id.in_(claimed)).order_by(ScrapeTask.id))
+        return [_task_dict(task) for task in tasks.scalars().all()]
+
+
+async def finish_task(task_id: int, attempts: int, result: dict = None, error: str = None) -> bool:
+    """Record the outcome of the claim that set ``attempts``; a failed attempt is requeued until TASK_MAX_ATTEMPTS.
+
+    Only updates the task while that claim still holds it (still running, not
+    re-claimed after its lease expired) and returns whether it did.
+    """
+    if error is None:
+        values = {"status": "done", "result": result, "error": None}
+    else:
+        values = {"status": "failed" if attempts >= TASK_MAX_ATTEMPTS else "queued", "error": error}
+    async with AsyncSessionLocal() as session:
+        updated = await session.execute(
+            update(ScrapeTask)
+            .where(ScrapeTask.id == task_id, ScrapeTask.attempts == attempts, ScrapeTask.status == "running")
+            .values(**values, finished_at=datetime.utcnow())
+        )
+        await session.commit()
+        return updated.rowcount == 1
+
+
+async def create_saved_search(query: str, location: str, sources: list, limit: int = 10, interval_minutes: int = 60):
+    async with AsyncSessionLocal() as session:
+        search = SavedSearch(
+            query=query,
+            location=location,
+            sources=",".join(sources),
+            per_source_limit=limit,
+            interval_minutes=interval_minutes,
+            enabled=True,
+            next_run_at=datetime.utcnow(),
+        )
+        session.add(search)
+        await session.commit()
+        return _search_dict(search)
+
+
+async def list_saved_searches():
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(SavedSearch).order_by(SavedSearch.id))
+        return [_search_dict(search) for search in result.scalars().all()]
+
+
+async def delete_saved_search(search_id: int) -> bool:
+    async with AsyncSessionLocal() as session:
+        search = await session.get(SavedSearch, search_id)
+        if search is None:
+            return False
+        await session.delete(search)
+        await session.commit()
+        return True
+
+
+async def enqueue_due_searches(now: datetime = None) -> int:
+    """Queue a task for every enabled saved search that is due and schedule its next run.
+
+    Like ``claim_tasks``, a search is only advanced (and queued) if its
+    ``next_run_at`` is still the one that was read, so concurrent workers
+    schedule each run once.
+    """
+    now = now or datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        query = (
+            select(SavedSearch)
+            .where(SavedSearch.enabled == True, SavedSearch.next_run_at <= now)  # noqa: E712
+            .order_by(SavedSearch.next_run_at)
+        )
+        if _dialect_name(session) == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        searches = (await session.execute(query)).scalars().all()
+
+        queued = 0
+        for search in searches:
+            result = await session.execute(
+                update(SavedSearch)
+                .where(SavedSearch.id == search.id, SavedSearch.next_run_at == search.next_run_at)
+                .values(last_run_at=now, next_run_at=now + timedelta(minutes=search.interval_minutes))
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                continue
+            session.add(ScrapeTask(
+                query=search.query,
+                location=search.location,
+                sources=search.sources,
+                per_source_limit=search.per_source_limit,
+                saved_search_id=search.id,
+                status="queued",
+                attempts=0,
+            ))
+            queued += 1
+        await session.commit()
+        return queued
@@ -3,15 +3,26 @@ from contextlib import asynccontextmanager
 from app.routes import jobs
 from app.db import engine
 from app.models import Base
-from app.cache import init_redis, close_redis
+from app.search import ensure_search_index
+from app.cache import init_cache, close_cache
+from app.scraper.http import init_http, close_http
+from app.scraper.workers import init_parse_pool, close_parse_pool
+from app.seen import init_seen, close_seen
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    await init_redis(app)
+        await ensure_search_index(conn)
+    await init_seen(app)
+    await init_cache(app)
+    await init_http(app)
+    await init_parse_pool(app)
     yield
-    await close_redis(app)
+    await close_parse_pool(app)
+    await close_http(app)
+    await close_cache(app)
+    await close_seen(app)
    
 
 app = FastAPI(
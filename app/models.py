@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, JSON, func
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import query_expression
 import datetime
 
 Base = declarative_base()
@@ -13,7 +14,73 @@ class Job(Base):
     location = Column(String)
     description = Column(String)
     url = Column(String)
+    # normalize_url(url); the identity used to upsert re-saved jobs
+    url_key = Column(String)
     source = Column(String, default="Unknown")
     liked = Column(Boolean, default=False)
     applied = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    # Relevance score of a full-text search, loaded only by search queries (see app.search)
+    search_rank = query_expression()
+
+    # /saved always sorts newest first (id breaks ties for keyset paging) and usually
+    # filters on one of liked/applied/source; export reads applied jobs only.
+    __table_args__ = (
+        Index("ux_jobs_url_key", url_key, unique=True),
+        Index("ix_jobs_created_at_id", created_at.desc(), id.desc()),
+        Index("ix_jobs_liked_created_at", liked, created_at.desc(), id.desc()),
+        Index("ix_jobs_applied_created_at", applied, created_at.desc(), id.desc()),
+        Index("ix_jobs_source_created_at", func.lower(source), created_at.desc(), id.desc()),
+        Index(
+            "ix_jobs_applied_only_created_at",
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=applied == True,  # noqa: E712
+            sqlite_where=applied == True,  # noqa: E712
+        ),
+    )
+
+
+class SavedSearch(Base):
+    """A scrape the worker repeats every ``interval_minutes`` (see ``app.worker``)."""
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True)
+    query = Column(String, nullable=False)
+    location = Column(String, default="")
+    # Comma-separated source names, as accepted by /scrape
+    sources = Column(String, nullable=False)
+    per_source_limit = Column(Integer, default=10)
+    interval_minutes = Column(Integer, default=60)
+    enabled = Column(Boolean, default=True)
+    next_run_at = Column(DateTime, default=datetime.datetime.utcnow)
+    last_run_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_saved_searches_due", enabled, next_run_at),
+    )
+
+
+class ScrapeTask(Base):
+    """One queued scrape; the table is the durable queue the workers claim from."""
+    __tablename__ = "scrape_tasks"
+
+    id = Column(Integer, primary_key=True)
+    query = Column(String, nullable=False)
+    location = Column(String, default="")
+    sources = Column(String, nullable=False)
+    per_source_limit = Column(Integer, default=10)
+    saved_search_id = Column(Integer)
+    # queued -> running -> done | failed (a failed attempt is re-queued until TASK_MAX_ATTEMPTS)
+    status = Column(String, default="queued", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    result = Column(JSON)
+    error = Column(String)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_scrape_tasks_status_created_at", status, created_at),
+    )
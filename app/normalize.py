@@ -0,0 +1,55 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track how a visitor reached a posting
+TRACKING_PARAMS = {
+    "refid",
+    "trackingid",
+    "trk",
+    "trkinfo",
+    "position",
+    "pagenum",
+    "originalsubdomain",
+    "lipi",
+    "gclid",
+    "fbclid",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# in.linkedin.com, uk.linkedin.com, ... all serve the same posting
+_LINKEDIN_HOST = re.compile(r"^(?:[a-z]{2}\.)?linkedin\.com$")
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a job URL, used as its identity across saves and sources.
+
+    Lowercases the host, drops ``www.`` and LinkedIn country prefixes, treats
+    http and https alike, removes the fragment, tracking parameters and a trailing
+    slash, and sorts the remaining query parameters.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if _LINKEDIN_HOST.match(host):
+        host = "linkedin.com"
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def normalize_term(text: str) -> str:
+    """Case- and whitespace-insensitive form of a search term (query, location)."""
+    return " ".join((text or "").lower().split())
@@ -0,0 +1,81 @@
+import asyncio
+import os
+from typing import List
+
+from app.crud import save_jobs_bulk
+
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "200"))
+PERSIST_QUEUE_SIZE = int(os.getenv("PERSIST_QUEUE_SIZE", "8"))
+
+_DONE = object()
+
+
+class PersistPipeline:
+    """Writes scraped jobs to the database while scraping is still running.
+
+    Producers ``put`` each parsed batch onto a bounded queue (so a slow database
+    pushes back on the scrapers instead of buffering without limit); one writer
+    task drains it into ``save_jobs_bulk`` calls. Under load batches fill up to
+    ``batch_size``; when the queue runs dry whatever is buffered is written at
+    once, so rows land as soon as the database is free.
+
+        async with PersistPipeline() as pipeline:
+            await pipeline.put(jobs)
+        pipeline.counts  # {"inserted": ..., "known": ...}
+    """
+
+    def __init__(self, batch_size: int = PERSIST_BATCH_SIZE, max_pending: int = PERSIST_QUEUE_SIZE) -> None:
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.counts = {"inserted": 0, "known": 0, "skipped": 0}
+        self._writer = None
+
+    async def __aenter__(self) -> "PersistPipeline":
+        self._writer = asyncio.ensure_future(self._write())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            return
+        await self.put(_DONE)
+        await self._writer
+
+    async def put(self, jobs) -> None:
+        put = asyncio.ensure_future(self.queue.put(jobs))
+        done, _ = await asyncio.wait({put, self._writer}, return_when=asyncio.FIRST_COMPLETED)
+        if put not in done:
+            # The writer died while we waited for room; surface its error
+            put.cancel()
+            await self._writer
+
+    def _valid(self, jobs: List[dict]) -> List[dict]:
+        valid = [
+            job for job in jobs
+            if job.get("title") and str(job.get("url", "")).startswith(("http://", "https://"))
+        ]
+        self.counts["skipped"] += len(jobs) - len(valid)
+        return valid
+
+    async def _flush(self, buffer: List[dict]) -> None:
+        if not buffer:
+            return
+        result = await save_jobs_bulk(buffer)
+        self.counts["inserted"] += result["inserted"]
+        self.counts["known"] += result["updated"]
+        buffer.clear()
+
+    async def _write(self) -> None:
+        buffer: List[dict] = []
+        while True:
+            item = await self.queue.get()
+            if item is _DONE:
+                await self._flush(buffer)
+                return
+            buffer.extend(self._valid(item))
+            while len(buffer) >= self.batch_size:
+                batch, buffer[:] = buffer[:self.batch_size], buffer[self.batch_size:]
+                await self._flush(batch)
+            if self.queue.empty():
+                await self._flush(buffer)
@@ -1,18 +1,38 @@
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
-from app.crud import save_job, get_saved_jobs, export_applied_jobs, update_job_status
-from app.schemas import JobCreate, JobStatusUpdate
-import io
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from app.crud import (
+    save_job, save_jobs_bulk, get_saved_jobs, stream_applied_jobs, update_job_status,
+    enqueue_scrape, get_task, create_saved_search, list_saved_searches, delete_saved_search,
+)
+from app.schemas import JobCreate, JobStatusUpdate, SavedSearchCreate
+from datetime import datetime
+from typing import List
+import json
+import os
+import zlib
+
+# Scrape results are served as-is for the soft TTL, then served stale while a
+# background scrape refreshes them, until the hard TTL drops them
+SCRAPE_CACHE_FRESH_SECONDS = int(os.getenv("SCRAPE_CACHE_FRESH_SECONDS", "300"))
+SCRAPE_CACHE_TTL_SECONDS = int(os.getenv("SCRAPE_CACHE_TTL_SECONDS", "3600"))
 
 router = APIRouter()
 
 @router.get("/scrape")
-async def scrape(request: Request, jobrole: str = "python developer", location: str = "pune", limit: int = 10, sources: str = "linkedin,careerjet,timesjobs"):
+async def scrape(request: Request, jobrole: str = "python developer", location: str = "pune", limit: int = 10, sources: str = "linkedin,careerjet,timesjobs", budget: float = Query(None, gt=0), persist: bool = False, new_only: bool = False, background: bool = False):
     from app.scraper import aggregate_jobs
 
     selected_sources = [s.strip().lower() for s in sources.split(",") if s.strip()]
 
-    from app.cache import build_cache_key, get_cache, set_cache
+    if background:
+        # Hand the scrape to a worker (python -m app.worker), which persists the results
+        task = await enqueue_scrape(jobrole, location, selected_sources, limit)
+        return JSONResponse(
+            status_code=202,
+            content={"task_id": task["task_id"], "status": task["status"], "poll": f"/api/jobs/tasks/{task['task_id']}"},
+        )
+
+    from app.cache import build_cache_key, dumps_json, get_or_build
     cache_key = build_cache_key(
         "scrape",
         query=jobrole,
@@ -20,22 +40,125 @@ async def scrape(request: Request, jobrole: str = "python developer", location:
         limit=limit,
         sources=",".join(selected_sources),
     )
-    cached = await get_cache(request.app, cache_key)
-    if cached is not None:
-        return cached
-
-    jobs = await aggregate_jobs(query=jobrole, location=location, limit=limit, sources=selected_sources)
-
-    payload = {
-        "total_jobs": len(jobs),
-        "jobs": jobs,
-        "query": jobrole,
-        "location": location,
-        "sources": selected_sources,
-        "per_source_limit": limit,
-    }
-    await set_cache(request.app, cache_key, payload, ttl_seconds=300)
-    return payload
+
+    async def _scrape():
+        source_status = {}
+        jobs = await aggregate_jobs(
+            query=jobrole, location=location, limit=limit, sources=selected_sources, budget=budget, report=source_status,
+            persist=persist, app=None if persist else request.app, new_only=new_only,
+        )
+        persisted = source_status.pop("persisted", None)
+        skipped_known = source_status.pop("skipped_known", None)
+
+        payload = {
+            "total_jobs": len(jobs),
+            "jobs": jobs,
+            "query": jobrole,
+            "location": location,
+            "sources": selected_sources,
+            "per_source_limit": limit,
+            "source_status": source_status,
+            "timed_out": [name for name, status in source_status.items() if status["status"] == "timeout"],
+        }
+        if persist:
+            payload["persisted"] = persisted
+        if new_only:
+            payload["skipped_known"] = skipped_known
+        return payload
+
+    # persist=true must actually scrape and write, so it bypasses the cache; what
+    # counts as new changes with every save, so new_only answers aren't cached
+    # either (the per-source fragments still are)
+    if persist or new_only:
+        return await _scrape()
+    # Concurrent identical misses share one scrape; partial results (a source
+    # failed, ran out of time or came back empty) are not cached, and neither is a
+    # scrape that ran no sources at all. The payload is cached as its encoded JSON
+    # body, so hits skip decoding and re-encoding
+    body = await get_or_build(
+        request.app,
+        cache_key,
+        _scrape,
+        ttl_seconds=SCRAPE_CACHE_TTL_SECONDS,
+        fresh_seconds=SCRAPE_CACHE_FRESH_SECONDS,
+        cacheable=lambda payload: bool(payload["source_status"]) and all(
+            status["status"] == "ok" and status["count"] > 0 for status in payload["source_status"].values()
+        ),
+        encode=dumps_json,
+    )
+    if not isinstance(body, bytes):
+        # Entry written before payloads were cached as bytes
+        return body
+    return Response(content=body, media_type="application/json")
+
+@router.get("/scrape/hosts")
+async def scrape_hosts(request: Request):
+    """Adaptive concurrency cap, requests in flight and Retry-After hold per scraped host."""
+    pool = getattr(request.app.state, "http", None)
+    return {"hosts": pool.host_stats() if pool is not None else {}}
+
+@router.get("/scrape/breakers")
+async def scrape_breakers():
+    """Circuit breaker state per source: closed, open (failing fast) or half_open (probing)."""
+    from app.scraper.resilience import breaker_states
+    return {"breakers": breaker_states()}
+
+@router.get("/cache/stats")
+async def cache_stats(request: Request):
+    """Hit/miss/coalesced counters for the local and Redis cache tiers."""
+    from app.cache import cache_stats as _cache_stats
+    return _cache_stats(request.app)
+
+@router.get("/scrape/stream")
+async def scrape_stream(request: Request, jobrole: str = "python developer", location: str = "pune", limit: int = 10, sources: str = "linkedin,careerjet,timesjobs", format: str = "ndjson", budget: float = Query(None, gt=0)):
+    """Stream each source's jobs as soon as it finishes, then a summary record.
+
+    ``format=ndjson`` (default) writes one JSON object per line; ``format=sse`` emits
+    Server-Sent Events named after the record type (``jobs`` / ``summary``).
+    """
+    from app.scraper import iter_jobs
+
+    if format not in {"ndjson", "sse"}:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+
+    selected_sources = [s.strip().lower() for s in sources.split(",") if s.strip()]
+
+    async def _body():
+        async for event in iter_jobs(
+            query=jobrole, location=location, limit=limit, sources=selected_sources, budget=budget, app=request.app
+        ):
+            data = json.dumps(event, default=str)
+            if format == "sse":
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+            else:
+                yield data + "\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(_body(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+@router.get("/tasks/{task_id}")
+async def task_status(task_id: int):
+    """Status of a background scrape; ``result`` holds its summary once ``done``."""
+    task = await get_task(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    return task
+
+@router.post("/searches", response_model=dict)
+async def add_saved_search(search: SavedSearchCreate):
+    """Save a search for the worker to scrape every ``interval_minutes``."""
+    sources = [s.strip().lower() for s in search.sources if s.strip()]
+    return await create_saved_search(search.query, search.location, sources, search.limit, search.interval_minutes)
+
+@router.get("/searches")
+async def saved_searches():
+    return {"searches": await list_saved_searches()}
+
+@router.delete("/searches/{search_id}", response_model=dict)
+async def remove_saved_search(search_id: int):
+    if not await delete_saved_search(search_id):
+        raise HTTPException(status_code=404, detail=f"Saved search {search_id} not found")
+    return {"message": "Saved search deleted", "id": search_id}
 
 @router.get("/saved")
 async def saved_jobs(
@@ -46,18 +169,27 @@ async def saved_jobs(
     liked: bool = None,
     applied: bool = None,
     limit: int = 10,
-    offset: int = 0
+    offset: int = 0,
+    cursor: str = None,
+    created_after: datetime = None,
+    created_before: datetime = None
 ):
-    return await get_saved_jobs(
-        search=search,
-        company=company,
-        location=location,
-        source=source,
-        liked=liked,
-        applied=applied,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        return await get_saved_jobs(
+            search=search,
+            company=company,
+            location=location,
+            source=source,
+            liked=liked,
+            applied=applied,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            created_after=created_after,
+            created_before=created_before
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/save", response_model=dict)
 async def save(job_data: JobCreate):
@@ -68,6 +200,14 @@ async def save(job_data: JobCreate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save job: {str(e)}")
 
+@router.post("/save/bulk", response_model=dict)
+async def save_bulk(jobs: List[JobCreate]):
+    """Upsert many jobs in one transaction; ``job_ids`` follow the input order."""
+    try:
+        return await save_jobs_bulk([job.model_dump() for job in jobs])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to save jobs: {str(e)}")
+
 @router.put("/{job_id}/status", response_model=dict)
 async def update_status(job_id: int, status_update: JobStatusUpdate):
     try:
@@ -81,35 +221,89 @@ async def update_status(job_id: int, status_update: JobStatusUpdate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update job status: {str(e)}")
 
+async def _prepend(first: bytes, rest):
+    yield first
+    async for chunk in rest:
+        yield chunk
+
+async def _gzip(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+async def _export_response(format: str, media_type: str, gzip: bool):
+    chunks = stream_applied_jobs(format=format)
+    first = await anext(chunks, None)
+    if first is None:
+        # Release its session and connection now rather than whenever it is collected
+        await chunks.aclose()
+        return {"message": "No applied jobs found"}
+
+    body = _prepend(first, chunks)
+    headers = {
+        "Content-Disposition": f"attachment; filename=applied_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}",
+    }
+    if gzip:
+        body = _gzip(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
 @router.get("/export")
-async def export_csv():
+async def export_csv(gzip: bool = False):
     try:
-        result = await export_applied_jobs()
-        
-        if not result.get("csv_data"):
-            return {"message": result["message"]}
-        
-        csv_data = result["csv_data"].encode('utf-8')
-        
-        return StreamingResponse(
-            io.BytesIO(csv_data),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={result['filename']}",
-                "Content-Type": "text/csv; charset=utf-8"
-            }
-        )
-        
+        return await _export_response("csv", "text/csv; charset=utf-8", gzip)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
 @router.get("/export/json")
-async def export_csv_json():
+async def export_csv_json(gzip: bool = False):
+    """Applied jobs as NDJSON, one object per line with the same fields as the CSV."""
     try:
-        return await export_applied_jobs()
+        return await _export_response("ndjson", "application/x-ndjson", gzip)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
+@router.get("/export/columnar")
+async def export_columnar(
+    format: str = "parquet",
+    source: str = None,
+    liked: bool = None,
+    applied: bool = None,
+    created_after: datetime = None,
+    created_before: datetime = None
+):
+    """Jobs as Parquet or an Arrow IPC stream for analytics, filtered like ``/saved``."""
+    from app.columnar import FORMATS, ColumnarUnavailable, stream_jobs_columnar
+
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(FORMATS)}")
+    media_type, extension = FORMATS[format]
+    try:
+        chunks = stream_jobs_columnar(
+            format=format,
+            source=source,
+            liked=liked,
+            applied=applied,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        first = await anext(chunks)
+    except ColumnarUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
+
+    return StreamingResponse(
+        _prepend(first, chunks),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+        },
+    )
+
 @router.get("/test-db")
 async def test_database():
     try:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class JobCreate(BaseModel):
@@ -22,3 +22,16 @@ class JobStatusUpdate(BaseModel):
     title: Optional[str] = None
     liked: Optional[bool] = None
     applied: Optional[bool] = None
+
+class SavedSearchCreate(BaseModel):
+    query: str
+    location: Optional[str] = ""
+    sources: List[str] = ["linkedin", "careerjet", "timesjobs"]
+    limit: int = 10
+    interval_minutes: int = 60
+
+    @field_validator('interval_minutes', 'limit')
+    def validate_positive(cls, v):
+        if v < 1:
+            raise ValueError('must be at least 1')
+        return v
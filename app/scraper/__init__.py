@@ -1,9 +1,16 @@
-from typing import List, Dict, Callable, Optional
+from typing import AsyncIterator, List, Dict, Callable, Optional
 import asyncio
+import contextlib
+import os
+import time
+
+from app.seen import is_seen
 
 from .linkedin import scrape_linkedin
 from .careerjet import scrape_careerjet
 from .timesjobs import scrape_timesjobs
+from .dedup import dedupe_jobs
+from .resilience import CircuitOpenError, breaker_for, source_deadline
 
 
 SCRAPERS: Dict[str, Callable[..., asyncio.Future]] = {
@@ -12,26 +19,246 @@ SCRAPERS: Dict[str, Callable[..., asyncio.Future]] = {
     "timesjobs": scrape_timesjobs,
 }
 
+
+# Whole-request latency budget and per-source deadlines, in seconds. A source can be
+# given its own deadline with e.g. SCRAPE_TIMEOUT_CAREERJET=8. Each HTTP attempt
+# within it is capped by SCRAPER_HTTP_TIMEOUT and its share of the time left, so
+# retries after a timed-out request still run before the deadline.
+SCRAPE_BUDGET = float(os.getenv("SCRAPE_BUDGET_SECONDS", "20"))
+SOURCE_TIMEOUT = float(os.getenv("SCRAPE_SOURCE_TIMEOUT", "15"))
+
+
+def source_timeout(name: str) -> float:
+    return float(os.getenv(f"SCRAPE_TIMEOUT_{name.upper()}", SOURCE_TIMEOUT))
+
+
+# How long one source's results for a (query, location, limit) are reused, in
+# seconds; per source with e.g. SCRAPE_CACHE_TTL_LINKEDIN=900
+SOURCE_CACHE_TTL = int(os.getenv("SCRAPE_SOURCE_CACHE_TTL", "600"))
+
+
+def source_cache_ttl(name: str) -> int:
+    return int(os.getenv(f"SCRAPE_CACHE_TTL_{name.upper()}", SOURCE_CACHE_TTL))
+
+
+def source_cache_key(name: str, query: str, location: str, limit: int) -> str:
+    from app.cache import build_cache_key
+    from app.normalize import normalize_term
+
+    return build_cache_key(
+        "source", source=name, query=normalize_term(query), location=normalize_term(location), limit=limit
+    )
+
+
+def _select_sources(sources: Optional[List[str]]) -> List[str]:
+    selected = [s.lower() for s in (sources or list(SCRAPERS.keys())) if s.lower() in SCRAPERS]
+    return list(dict.fromkeys(selected))
+
+
+async def _run_source(name: str, query: str, location: str, limit: int, timeout: float):
+    """Run one scraper under its deadline and circuit breaker; never raises (except on cancel)."""
+    started = time.perf_counter()
+    breaker = breaker_for(name)
+    try:
+        breaker.before_call()
+        with source_deadline(timeout):
+            jobs = await asyncio.wait_for(SCRAPERS[name](query=query, location=location, limit=limit), timeout)
+        breaker.record_success()
+        status = {"status": "ok", "count": len(jobs or [])}
+    except CircuitOpenError as e:
+        # Failing fast: the source is known to be down, don't spend its timeout on it
+        jobs = []
+        status = {"status": "error", "count": 0, "error": str(e)}
+    except asyncio.TimeoutError:
+        breaker.record_failure()
+        jobs = []
+        status = {"status": "timeout", "count": 0}
+    except asyncio.CancelledError:
+        breaker.release()
+        raise
+    except Exception as e:  # noqa: BLE001
+        breaker.record_failure()
+        jobs = []
+        status = {"status": "error", "count": 0, "error": str(e) or type(e).__name__}
+    status["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return name, list(jobs or []), status
+
+
+async def _run_cached_source(app, name: str, query: str, location: str, limit: int, timeout: float, fragment=None):
+    """``_run_source`` behind the per-source fragment cache; only non-empty ``ok`` results are stored.
+
+    ``fragment`` is the entry already fetched for this source, if any.
+    """
+    from app.cache import get_or_build
+
+    started = time.perf_counter()
+    scraped = {}
+
+    async def _scrape():
+        _, jobs, status = await _run_source(name, query, location, limit, timeout)
+        scraped["status"] = status
+        return {"jobs": jobs, "status": status}
+
+    if fragment is None:
+        fragment = await get_or_build(
+            app,
+            source_cache_key(name, query, location, limit),
+            _scrape,
+            ttl_seconds=source_cache_ttl(name),
+            # An empty page is as likely a throttled or blocked request as a real "no jobs"
+            cacheable=lambda fragment: fragment["status"]["status"] == "ok" and bool(fragment["jobs"]),
+            lookup=False,
+        )
+    status = scraped.get("status")
+    if status is None:
+        # Served from the cache, or by a concurrent request's scrape of the same source
+        status = {
+            "status": fragment["status"]["status"],
+            "count": len(fragment["jobs"]),
+            "cached": True,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    return name, fragment["jobs"], status
+
+
+async def iter_jobs(
+    query: str = "python developer",
+    location: str = "remote",
+    limit: int = 10,
+    sources: Optional[List[str]] = None,
+    budget: Optional[float] = None,
+    app=None,
+) -> AsyncIterator[dict]:
+    """Run selected scrapers concurrently and yield each source's jobs as soon as it finishes.
+
+    Yields ``{"type": "jobs", "source", "jobs"}`` events in completion order and ends
+    with ``{"type": "summary", "sources", "total_jobs", "elapsed_ms"}`` carrying per-source
+    status (``ok``, ``error`` or ``timeout``) and timings. Each source gets its own
+    deadline, capped by the request ``budget``; when the budget runs out the sources
+    still running are cancelled and reported as timed out. Closing the generator early
+    also cancels the sources still running.
+
+    With ``app``, each source's results are looked up in (and stored to) the app
+    cache per source, normalized query/location and limit, so requests for
+    different source combinations share work; cached sources report ``cached``.
+    A source scrape shared with another request is only cancelled once no request
+    is waiting on it.
+    """
+    selected_sources = _select_sources(sources)
+    budget = SCRAPE_BUDGET if budget is None else budget
+    started = time.perf_counter()
+    deadline = started + budget
+    statuses: Dict[str, dict] = {}
+    total = 0
+
+    fragments = {}
+    if app is not None:
+        from app.cache import get_many
+
+        # One round trip for every selected source's cached fragment
+        keys = {name: source_cache_key(name, query, location, limit) for name in selected_sources}
+        found = await get_many(app, keys.values())
+        fragments = {name: found[key] for name, key in keys.items() if key in found}
+
+    def _start(name: str) -> asyncio.Future:
+        timeout = min(source_timeout(name), budget)
+        if app is None:
+            return asyncio.ensure_future(_run_source(name, query, location, limit, timeout))
+        return asyncio.ensure_future(
+            _run_cached_source(app, name, query, location, limit, timeout, fragment=fragments.get(name))
+        )
+
+    running = {_start(name): name for name in selected_sources}
+    pending = set(running)
+    try:
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name, jobs, status = task.result()
+                statuses[name] = status
+                total += len(jobs)
+                yield {"type": "jobs", "source": name, "jobs": jobs}
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    for task in pending:
+        statuses[running[task]] = {"status": "timeout", "count": 0, "elapsed_ms": elapsed_ms}
+
+    yield {
+        "type": "summary",
+        "sources": {name: statuses[name] for name in selected_sources if name in statuses},
+        "total_jobs": total,
+        "elapsed_ms": elapsed_ms,
+    }
+
+
 async def aggregate_jobs(
     query: str = "python developer",
     location: str = "remote",
     limit: int = 10,
     sources: Optional[List[str]] = None,
+    budget: Optional[float] = None,
+    report: Optional[dict] = None,
+    persist: bool = False,
+    app=None,
+    dedupe: bool = True,
+    new_only: bool = False,
 ) -> List[dict]:
-    """Run selected scrapers concurrently and combine results. Limit is per source."""
-    selected_sources = [s.lower() for s in (sources or list(SCRAPERS.keys())) if s.lower() in SCRAPERS]
+    """Run selected scrapers concurrently and combine results. Limit is per source.
+
+    Sources that fail or miss their deadline contribute nothing; pass a ``report``
+    dict to receive each source's status and timing. With ``persist`` each source's
+    jobs are written to the database as soon as they are parsed (see
+    ``app.pipeline``), and ``report["persisted"]`` holds the inserted/known counts.
+    Passing ``app`` enables the per-source cache (see ``iter_jobs``).
+
+    With ``dedupe`` (the default) the same posting found on several boards is
+    returned once, with ``sources`` listing where it was found (see ``dedup``).
+
+    With ``new_only`` jobs whose URL is already stored (per the seen-URL filter in
+    ``app.seen``) are left out, and ``report["skipped_known"]`` counts them.
+    """
+    selected_sources = _select_sources(sources)
     if not selected_sources:
         return []
 
-    # Apply the requested limit per source
-    tasks = [SCRAPERS[name](query=query, location=location, limit=limit) for name in selected_sources]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Apply the requested limit per source; keep results in the requested source order
+    per_source: Dict[str, List[dict]] = {}
+    skipped = 0
+    pipeline = None
+    if persist:
+        from app.pipeline import PersistPipeline
+
+        pipeline = PersistPipeline()
+
+    async with pipeline or contextlib.nullcontext():
+        async for event in iter_jobs(
+            query=query, location=location, limit=limit, sources=selected_sources, budget=budget, app=app
+        ):
+            if event["type"] == "jobs":
+                jobs = event["jobs"]
+                if new_only:
+                    jobs = [job for job in jobs if not is_seen(job.get("url", ""))]
+                    skipped += len(event["jobs"]) - len(jobs)
+                per_source[event["source"]] = jobs
+                if pipeline is not None:
+                    await pipeline.put(event["jobs"])
+            elif report is not None:
+                report.update(event["sources"])
+    if pipeline is not None and report is not None:
+        report["persisted"] = pipeline.counts
+    if new_only and report is not None:
+        report["skipped_known"] = skipped
 
     combined: List[dict] = []
-    for res in results:
-        if isinstance(res, Exception):
-            continue
-        if isinstance(res, list):
-            combined.extend(res)
+    for name in selected_sources:
+        combined.extend(per_source.get(name, []))
 
-    return combined
\ No newline at end of file
+    return dedupe_jobs(combined) if dedupe else combined
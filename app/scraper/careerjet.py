@@ -3,13 +3,23 @@ from __future__ import annotations
 import argparse
 import asyncio
 import csv
+import functools
 import json
+import os
 import re
 import sys
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-import httpx
-from bs4 import BeautifulSoup
+if not __package__:
+    # Run as a script (python app/scraper/careerjet.py): import the app package from the
+    # project root instead of this directory, whose http.py would shadow the stdlib
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scraper.concurrency import race_first
+from app.scraper.http import http_pool
+from app.scraper.parsing import Selector, SelectorChain, attr, parse_html, text
+from app.scraper.resilience import ScrapeError, fetch
+from app.scraper.workers import run_parser
 
 
 DEFAULT_HEADERS = {
@@ -30,12 +40,6 @@ def _slugify(text: str) -> str:
     return cleaned
 
 
-def _first_text(el) -> str:
-    if not el:
-        return ""
-    return el.get_text(strip=True)
-
-
 def _normalize_url(href: Optional[str]) -> str:
     if not href:
         return ""
@@ -44,24 +48,32 @@ def _normalize_url(href: Optional[str]) -> str:
     return f"https://www.careerjet.com{href}"
 
 
+# Compiled once; the "or" cascades from the original select_one chains
+CARDS = SelectorChain(
+    "article.job",
+    "section.job",
+    "div.job",
+    "li.job",
+    "div[id^='job_']",
+    ".job",
+    ".jobs .result, .job-list .result",
+)
+TITLE = SelectorChain("h2 a", "a.title", "a[data-ga-tag='job-title']", "a")
+COMPANY = Selector(".company, .company_name, span.company, div.job header div a")
+LOCATION = Selector(".locations, span.location, .job-location")
+
+
 def _extract_job_card(card) -> Dict[str, str]:
     # Title + URL
-    title_el = (
-        card.select_one("h2 a")
-        or card.select_one("a.title")
-        or card.select_one("a[data-ga-tag='job-title']")
-        or card.select_one("a")
-    )
-    title = _first_text(title_el)
-    url = _normalize_url(title_el.get("href") if title_el else "")
+    title_el = TITLE.first(card)
+    title = text(title_el)
+    url = _normalize_url(attr(title_el, "href"))
 
     # Company
-    company_el = card.select_one(".company, .company_name, span.company, div.job header div a")
-    company = _first_text(company_el) or "Unknown Company"
+    company = text(COMPANY.first(card)) or "Unknown Company"
 
     # Location
-    location_el = card.select_one(".locations, span.location, .job-location")
-    location = _first_text(location_el) or "Remote"
+    location = text(LOCATION.first(card)) or "Remote"
 
     return {
         "title": title,
@@ -71,7 +83,10 @@ def _extract_job_card(card) -> Dict[str, str]:
     }
 
 
-def scrape_careerjet_sync(query: str, location: str, limit: int = 10, timeout: float = 15.0) -> List[Dict[str, str]]:
+RACE_WIDTH = int(os.getenv("CAREERJET_RACE_WIDTH", "3"))
+
+
+def _candidate_urls(query: str, location: str) -> List[str]:
     keyword_slug = _slugify(query)
     loc_input = (location or "").strip().lower()
     is_remote = loc_input in {"remote", "work from home", "wfh", "anywhere"}
@@ -101,59 +116,75 @@ def scrape_careerjet_sync(query: str, location: str, limit: int = 10, timeout: f
         f"https://www.careerjet.com/jobs?s={keyword_slug}",
         f"https://www.careerjet.co.in/jobs?s={keyword_slug}",
     ]
+    # Remote searches list the no-location URLs twice; keep the first occurrence
+    return list(dict.fromkeys(url_candidates))
+
 
-    client = httpx.Client(headers=DEFAULT_HEADERS, follow_redirects=True, timeout=timeout)
-    last_error: Optional[Exception] = None
-    results: List[Dict[str, str]] = []
+def _parse_cards(html: bytes, limit: int) -> List[Tuple[str, str, str, str]]:
+    """Return up to ``limit`` ``(title, company, location, url)`` tuples; runs in the parse pool."""
+    cards = CARDS.all(parse_html(html))
 
-    for candidate in url_candidates:
+    results: List[Tuple[str, str, str, str]] = []
+    for card in cards:
+        if len(results) >= limit:
+            break
         try:
-            resp = client.get(candidate)
-            resp.raise_for_status()
-            html = resp.text
-        except Exception as e:  # noqa: BLE001
-            last_error = e
+            data = _extract_job_card(card)
+            if data.get("title") and data.get("url"):
+                results.append((data["title"], data["company"], data["location"], data["url"]))
+        except Exception:  # noqa: BLE001
             continue
+    return results
 
-        soup = BeautifulSoup(html, "html.parser")
-        # Common wrappers: try several possibilities
-        cards = (
-            soup.select("article.job")
-            or soup.select("section.job")
-            or soup.select("div.job")
-            or soup.select("li.job")
-            or soup.select("div[id^='job_']")
-            or soup.select(".job")
-        )
 
-        if not cards:
-            cards = soup.select(".jobs .result, .job-list .result")
+async def scrape_careerjet_raw(
+    query: str, location: str, limit: int = 10, timeout: Optional[float] = None, width: int = RACE_WIDTH
+) -> List[Dict[str, str]]:
+    """Race the candidate URLs (``width`` at a time) and keep the first page with cards.
 
-        if not cards:
-            continue
+    Each candidate retries transient errors itself (see ``resilience.fetch``);
+    ``timeout`` overrides the pool's per-attempt timeout.
+    Raises ``ScrapeError`` when every candidate failed, rather than returning an
+    empty result that looks like a search with no jobs.
+    """
+    errors: List[Exception] = []
+    fetch_kwargs = {"headers": DEFAULT_HEADERS}
+    if timeout is not None:
+        fetch_kwargs["timeout"] = timeout
+
+    async with http_pool() as pool:
 
-        for card in cards:
-            if len(results) >= limit:
-                break
+        async def _attempt(candidate: str) -> List[Tuple[str, str, str, str]]:
             try:
-                data = _extract_job_card(card)
-                if data.get("title") and data.get("url"):
-                    results.append(data)
-            except Exception:  # noqa: BLE001
-                continue
+                resp = await fetch(pool, candidate, **fetch_kwargs)
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+                raise
+            return await run_parser(_parse_cards, resp.content, limit)
+
+        candidates = _candidate_urls(query, location)
+        results = await race_first(
+            (functools.partial(_attempt, candidate) for candidate in candidates),
+            width=width,
+        )
 
-        if results:
-            break
+    if not results and len(errors) == len(candidates):
+        raise ScrapeError(f"CareerJet search failed on every domain; last error: {errors[-1]}")
+
+    return [
+        {"title": title, "company": company, "location": job_location, "url": url}
+        for title, company, job_location, url in (results or [])[:limit]
+    ]
 
-    if not results and last_error is not None:
-        print(f"[WARN] CareerJet fetched but no results; last error: {last_error}")
 
-    return results[:limit]
+def scrape_careerjet_sync(query: str, location: str, limit: int = 10, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+    """Blocking entry point for the CLI; runs the async engine on a fresh event loop."""
+    return asyncio.run(scrape_careerjet_raw(query, location, limit, timeout))
 
 
 async def scrape_careerjet(query: str = "python developer", location: str = "remote", limit: int = 10) -> List[Dict[str, str]]:
     """Scrape CareerJet job listings and return normalized results."""
-    raw = await asyncio.to_thread(scrape_careerjet_sync, query, location, limit, 15.0)
+    raw = await scrape_careerjet_raw(query, location, limit)
     normalized: List[Dict[str, str]] = []
     for row in raw[:limit]:
         normalized.append(
@@ -200,7 +231,11 @@ def _parse_args(argv: List[str]) -> argparse.Namespace:
 if __name__ == "__main__":
     args = _parse_args(sys.argv[1:])
     print("[START] CareerJet Scraper Started")
-    rows = scrape_careerjet_sync(args.query, args.location, args.num_results, 15.0)
+    try:
+        rows = scrape_careerjet_sync(args.query, args.location, args.num_results)
+    except ScrapeError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
     print(f"[RESULTS] Collected {len(rows)} records")
     if args.output:
         _write_output(rows, args.output)
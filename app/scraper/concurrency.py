@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+async def race_first(
+    factories: Iterable[Callable[[], Awaitable[T]]],
+    accept: Callable[[T], bool] = bool,
+    width: int = 3,
+) -> Optional[T]:
+    """Run at most ``width`` attempts at a time and return the first accepted result.
+
+    Attempts are started in iteration order; a finished attempt frees its slot for
+    the next one. Once a result passes ``accept`` the remaining attempts are
+    cancelled. Failed or rejected attempts are ignored; ``None`` means none won.
+    """
+    pending_factories = enumerate(factories)
+    running: Dict[asyncio.Future, int] = {}
+
+    def _launch() -> None:
+        while len(running) < max(1, width):
+            item = next(pending_factories, None)
+            if item is None:
+                return
+            index, factory = item
+            running[asyncio.ensure_future(factory())] = index
+
+    _launch()
+    try:
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            # Several attempts can finish together; prefer the earliest candidate.
+            for task in sorted(done, key=running.__getitem__):
+                running.pop(task)
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                result = task.result()
+                if accept(result):
+                    return result
+            _launch()
+        return None
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+async def first_by_priority(
+    factories: Iterable[Callable[[], Awaitable[T]]],
+    accept: Callable[[T], bool] = bool,
+) -> Optional[T]:
+    """Run every attempt at once but return the accepted result of the earliest one.
+
+    Unlike ``race_first``, a later attempt that answers sooner only wins once every
+    earlier attempt has failed or been rejected, so a fallback is never preferred
+    over a better candidate that is merely slower. ``None`` means none was accepted.
+    """
+    tasks = [asyncio.ensure_future(factory()) for factory in factories]
+    try:
+        for task in tasks:
+            try:
+                result = await task
+            except Exception:  # noqa: BLE001
+                continue
+            if accept(result):
+                return result
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def ordered_window(
+    fetch: Callable[[int], Awaitable[T]],
+    pages: Iterable[int],
+    window: int = 3,
+) -> AsyncIterator[Tuple[int, T]]:
+    """Fetch up to ``window`` pages concurrently and yield ``(page, result)`` in page order.
+
+    Stop iterating (inside ``contextlib.aclosing``) to cancel the pages still in flight.
+    """
+    pending_pages = iter(pages)
+    in_flight: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    def _launch() -> None:
+        while len(in_flight) < max(1, window):
+            page = next(pending_pages, None)
+            if page is None:
+                return
+            in_flight.append((page, asyncio.ensure_future(fetch(page))))
+
+    _launch()
+    try:
+        while in_flight:
+            page, task = in_flight.popleft()
+            result = await task
+            yield page, result
+            _launch()
+    finally:
+        for _, task in in_flight:
+            task.cancel()
+        if in_flight:
+            await asyncio.gather(*(task for _, task in in_flight), return_exceptions=True)
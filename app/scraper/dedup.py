@@ -0,0 +1,135 @@
+import functools
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.normalize import normalize_url
+
+# Titles whose SimHash fingerprints differ in at most this many of 64 bits are
+# treated as the same posting (within one company and location)
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", "3"))
+# 64 bits split into DEDUP_MAX_DISTANCE + 1 bands: two fingerprints within the
+# distance must agree on at least one band, so only band-mates are compared
+_BANDS = DEDUP_MAX_DISTANCE + 1
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+COMPANY_SUFFIXES = {
+    "pvt", "private", "ltd", "limited", "inc", "llc", "llp", "plc", "corp", "corporation", "co", "company", "gmbh",
+}
+# Fallbacks the scrapers fill in when a card has no company or location; they say
+# nothing about the posting, so they count as missing rather than as a match
+PLACEHOLDER_COMPANIES = {"unknown company", "unknown", "not disclosed", "confidential"}
+PLACEHOLDER_LOCATIONS = {"remote"}
+TITLE_ALIASES = {
+    "sr": "senior",
+    "jr": "junior",
+    "engg": "engineer",
+    "eng": "engineer",
+    "dev": "developer",
+    "mgr": "manager",
+}
+
+
+def _tokens(text: str) -> List[str]:
+    return _NON_ALNUM.sub(" ", (text or "").lower().replace("&", " and ")).split()
+
+
+def normalize_company(company: str) -> str:
+    tokens = _tokens(company)
+    if " ".join(tokens) in PLACEHOLDER_COMPANIES:
+        return ""
+    return " ".join(token for token in tokens if token not in COMPANY_SUFFIXES)
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(TITLE_ALIASES.get(token, token) for token in _tokens(title))
+
+
+def normalize_location(location: str) -> str:
+    # "Pune, Maharashtra, India" and "Pune" are the same place for our purposes
+    place = " ".join(_tokens((location or "").split(",")[0]))
+    return "" if place in PLACEHOLDER_LOCATIONS else place
+
+
+@functools.lru_cache(maxsize=4096)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over the words of ``text`` (order-insensitive)."""
+    weights = [0] * 64
+    for token in text.split():
+        value = _token_hash(token)
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    width = 64 // _BANDS
+    mask = (1 << width) - 1
+    return [(band, fingerprint >> (band * width) & mask) for band in range(_BANDS)]
+
+
+def _merge(record: dict, job: dict) -> None:
+    source = job.get("source")
+    if source and source not in record["sources"]:
+        record["sources"].append(source)
+    for field, value in job.items():
+        if field != "sources" and value and not record.get(field):
+            record[field] = value
+
+
+def dedupe_jobs(jobs: List[dict]) -> List[dict]:
+    """Merge postings of the same job found on several boards, keeping first-seen order.
+
+    Two jobs are the same when their normalized URLs match, or when they come from
+    different sources, have the same normalized company and compatible locations,
+    and their title SimHashes are within ``DEDUP_MAX_DISTANCE`` bits. Jobs from one
+    source with different URLs are different postings, and jobs without a company
+    (or with a placeholder like "Unknown Company") only merge on URL. Each returned
+    record is the first occurrence, with empty fields filled in from its duplicates
+    and ``sources`` listing every source it was found on.
+    """
+    records: List[dict] = []
+    by_url: Dict[str, int] = {}
+    by_band: Dict[tuple, List[int]] = {}
+    fingerprints: List[Optional[int]] = []
+    places: List[str] = []
+
+    for job in jobs:
+        url_key = normalize_url(job.get("url", ""))
+        company = normalize_company(job.get("company", ""))
+        place = normalize_location(job.get("location", ""))
+        fingerprint = simhash(normalize_title(job.get("title", ""))) if company else None
+
+        source = job.get("source")
+        match = by_url.get(url_key) if url_key else None
+        if match is None and fingerprint is not None:
+            for band in _bands(fingerprint):
+                for index in by_band.get((company, band), ()):
+                    if source and source in records[index]["sources"]:
+                        continue
+                    same_place = not place or not places[index] or place == places[index]
+                    if same_place and bin(fingerprint ^ fingerprints[index]).count("1") <= DEDUP_MAX_DISTANCE:
+                        match = index
+                        break
+                if match is not None:
+                    break
+
+        if match is None:
+            match = len(records)
+            records.append({**job, "sources": [source] if source else []})
+            fingerprints.append(fingerprint)
+            places.append(place)
+            if fingerprint is not None:
+                for band in _bands(fingerprint):
+                    by_band.setdefault((company, band), []).append(match)
+        else:
+            _merge(records[match], job)
+        if url_key:
+            by_url.setdefault(url_key, match)
+
+    return records
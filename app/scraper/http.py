@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+from .ratelimit import AdaptiveLimit, TokenBucket, retry_after_seconds
+
+try:
+    import h2  # type: ignore  # noqa: F401
+    HTTP2_AVAILABLE = True
+except Exception:  # pragma: no cover
+    HTTP2_AVAILABLE = False
+
+
+# Per request attempt. Keep it well under SCRAPE_SOURCE_TIMEOUT: a source gets
+# 1 + SCRAPER_RETRIES attempts in its deadline (``resilience.fetch`` also shrinks
+# each attempt to its share of the time left), 3 x 5 s in the default 15 s
+HTTP_TIMEOUT = float(os.getenv("SCRAPER_HTTP_TIMEOUT", "5"))
+MAX_CONNECTIONS = int(os.getenv("SCRAPER_MAX_CONNECTIONS", "100"))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("SCRAPER_MAX_CONNECTIONS_PER_HOST", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("SCRAPER_KEEPALIVE_EXPIRY", "30"))
+
+
+class HostPool:
+    """Shared httpx client with keep-alive, HTTP/2 and per-host politeness.
+
+    httpx only limits connections across the whole pool, so each request to a
+    host also takes a token from that host's rate limiter (shared across
+    processes through Redis when given) and a slot under its adaptive
+    concurrency cap, which shrinks on 429/503 and honours ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = MAX_CONNECTIONS,
+        max_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        timeout: float = HTTP_TIMEOUT,
+        http2: bool = HTTP2_AVAILABLE,
+        redis=None,
+    ) -> None:
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        self.client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=timeout,
+            limits=limits,
+            http2=http2,
+        )
+        self.max_per_host = max_per_host
+        self.rate = TokenBucket(redis)
+        self._host_slots: Dict[str, AdaptiveLimit] = {}
+
+    def _slot(self, host: str) -> AdaptiveLimit:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = AdaptiveLimit(self.max_per_host)
+            self._host_slots[host] = slot
+        return slot
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        host = httpx.URL(url).host
+        slot = self._slot(host)
+        async with slot:
+            await self.rate.acquire(host)
+            response = await self.client.get(url, **kwargs)
+            slot.observe(response.status_code, retry_after_seconds(response.headers.get("retry-after")))
+        return response
+
+    def host_stats(self) -> Dict[str, dict]:
+        return {host: slot.snapshot() for host, slot in self._host_slots.items()}
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_pool: Optional[HostPool] = None
+
+
+async def init_http(app) -> None:
+    global _pool
+    _pool = HostPool(redis=getattr(app.state, "redis", None))
+    app.state.http = _pool
+
+
+async def close_http(app) -> None:
+    global _pool
+    pool = getattr(app.state, "http", None)
+    if pool is not None:
+        try:
+            await pool.aclose()
+        except Exception:
+            pass
+    app.state.http = None
+    _pool = None
+
+
+@asynccontextmanager
+async def http_pool() -> AsyncIterator[HostPool]:
+    """Yield the process-wide pool, or a short-lived one outside the app lifespan (CLI, tests)."""
+    if _pool is not None:
+        yield _pool
+        return
+    pool = HostPool()
+    try:
+        yield pool
+    finally:
+        await pool.aclose()
@@ -1,5 +1,13 @@
+import contextlib
+import os
+
 import httpx
-from bs4 import BeautifulSoup
+
+from .concurrency import ordered_window
+from .http import http_pool
+from .resilience import ScrapeError, fetch
+from .parsing import Selector, attr, parse_html, text
+from .workers import run_parser
 
 headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
@@ -9,9 +17,73 @@ headers = {
     "Connection": "keep-alive"
 }
 
+SEARCH_URL = "https://www.linkedin.com/jobs/search"
+# Guest endpoint the search page itself calls for "see more jobs"; pages by `start`
+PAGING_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+MAX_PAGES = int(os.getenv("LINKEDIN_MAX_PAGES", "10"))
+PAGE_WINDOW = int(os.getenv("LINKEDIN_PAGE_WINDOW", "3"))
+
+
+CARD = Selector("li.base-card, .job-search-card, [data-job-id], div[data-job-id]")
+TITLE = Selector(".base-search-card__title, .job-search-card__title, h3, h2")
+COMPANY = Selector(
+    ".base-search-card__subtitle, .job-search-card__subtitle, [data-testid='job-search-card__company-name']"
+)
+LOCATION = Selector(
+    ".job-search-card__location, .base-search-card__metadata, [data-testid='job-search-card__location']"
+)
+LINK = Selector("a")
+
+
+def _parse_cards(html):
+    """Return ``(job_key, title, company, location, url)`` for every usable card on a page.
+
+    Runs in the parse pool, so it only takes bytes and returns plain tuples.
+    """
+    root = parse_html(html)
+    parsed = []
+
+    for card in CARD.all(root):
+        try:
+            title = text(TITLE.first(card))
+            company = text(COMPANY.first(card)) or "Unknown Company"
+            location = text(LOCATION.first(card)) or "Remote"
+
+            link_elem = LINK.first(card)
+            if link_elem is None:
+                link_elem = card
+            job_url = ""
+            href = attr(link_elem, "href")
+            if href:
+                if href.startswith("/"):
+                    job_url = f"https://www.linkedin.com{href}"
+                else:
+                    job_url = href
+
+            job_id = attr(card, "data-job-id") or ""
+            if not job_id:
+                urn = attr(card, "data-entity-urn") or ""
+                job_id = urn.rsplit(":", 1)[-1] if urn.startswith("urn:li:jobPosting:") else ""
+            if job_id and not job_url:
+                job_url = f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+            if title and job_url:
+                parsed.append((job_id or job_url.split("?", 1)[0], title, company, location, job_url))
+
+        except Exception:
+            continue
+
+    return parsed
+
+
 async def scrape_linkedin(query: str = "python developer", location: str = "remote", limit: int = 10):
-    """Scrape LinkedIn job listings and return normalized results."""
-    base_url = "https://www.linkedin.com/jobs/search"
+    """Scrape LinkedIn job listings and return normalized results.
+
+    The first results page sizes the paging; further pages are fetched through
+    the guest API by ``start`` offset, a few at a time, until ``limit`` unique
+    jobs (by job id) are collected or a page adds nothing new. Raises
+    ``ScrapeError`` when the search page itself can't be fetched.
+    """
     params = {
         "keywords": query,
         "location": location,
@@ -19,67 +91,67 @@ async def scrape_linkedin(query: str = "python developer", location: str = "remo
         "position": 1,
         "pageNum": 0
     }
-    
-    url = f"{base_url}?{httpx.QueryParams(params)}"
-    
-    try:
-        async with httpx.AsyncClient(headers=headers, follow_redirects=True, timeout=15.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-    except Exception:
-        return []
-
-    soup = BeautifulSoup(response.text, "html.parser")
+
+    url = f"{SEARCH_URL}?{httpx.QueryParams(params)}"
+
     jobs = []
-    
-    job_cards = (
-        soup.select("li.base-card, .job-search-card, [data-job-id], div[data-job-id]")
-        or []
-    )
-    
-    for card in job_cards[:limit]:
-        try:
-            title_elem = card.select_one(".base-search-card__title, .job-search-card__title, h3, h2")
-            title = title_elem.get_text(strip=True) if title_elem else ""
-            
-            company_elem = card.select_one(
-                ".base-search-card__subtitle, .job-search-card__subtitle, [data-testid='job-search-card__company-name']"
-            )
-            company = company_elem.get_text(strip=True) if company_elem else "Unknown Company"
-            
-            location_elem = card.select_one(
-                ".job-search-card__location, .base-search-card__metadata, [data-testid='job-search-card__location']"
-            )
-            location = location_elem.get_text(strip=True) if location_elem else "Remote"
-            
-            link_elem = card.select_one("a") or card
-            job_url = ""
-            if link_elem:
-                href = link_elem.get("href")
-                if href:
-                    if href.startswith("/"):
-                        job_url = f"https://www.linkedin.com{href}"
-                    else:
-                        job_url = href
-            
-            job_id = card.get("data-job-id") or ""
-            if job_id and not job_url:
-                job_url = f"https://www.linkedin.com/jobs/view/{job_id}/"
-            
-            if title and job_url:
-                job = {
+    seen = set()
+
+    def _collect(cards) -> int:
+        added = 0
+        for key, title, company, job_location, job_url in cards:
+            if len(jobs) >= limit:
+                break
+            if key in seen:
+                continue
+            seen.add(key)
+            jobs.append(
+                {
                     "title": title,
                     "company": company,
-                    "location": location,
+                    "location": job_location,
                     "description": "",
                     "url": job_url,
                     "liked": False,
                     "applied": False,
                     "source": "LinkedIn"
                 }
-                jobs.append(job)
-                
-        except Exception:
-            continue
-    
+            )
+            added += 1
+        return added
+
+    async with http_pool() as pool:
+        try:
+            response = await fetch(pool, url, headers=headers)
+        except Exception as e:
+            raise ScrapeError(f"LinkedIn search failed: {e}") from e
+
+        first_page = await run_parser(_parse_cards, response.content)
+        _collect(first_page)
+        if len(jobs) >= limit or not first_page:
+            return jobs
+
+        page_size = len(first_page)
+        pages_needed = -(-(limit - len(jobs)) // page_size)
+
+        async def _fetch_page(page: int):
+            paging_params = {
+                "keywords": query,
+                "location": location,
+                "f_TPR": "r86400",
+                "start": page * page_size,
+            }
+            try:
+                resp = await fetch(pool, PAGING_URL, params=paging_params, headers=headers)
+            except Exception:
+                # Keep what the earlier pages found; paging stops at the first gap
+                return []
+            return await run_parser(_parse_cards, resp.content)
+
+        window = max(1, min(PAGE_WINDOW, pages_needed))
+        async with contextlib.aclosing(ordered_window(_fetch_page, range(1, MAX_PAGES), window)) as pages:
+            async for _, cards in pages:
+                if not _collect(cards) or len(jobs) >= limit:
+                    break
+
     return jobs
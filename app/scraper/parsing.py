@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+from typing import Any, List, Optional, Union
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html  # type: ignore
+    from cssselect import HTMLTranslator  # type: ignore
+    from lxml import etree  # type: ignore
+except Exception:  # pragma: no cover
+    lxml = None  # type: ignore
+    etree = None  # type: ignore
+    HTMLTranslator = None  # type: ignore
+
+
+LXML_AVAILABLE = etree is not None and HTMLTranslator is not None
+BACKENDS = ("lxml", "bs4") if LXML_AVAILABLE else ("bs4",)
+BACKEND = os.getenv("SCRAPER_PARSER", BACKENDS[0])
+
+Markup = Union[str, bytes]
+
+
+def parse_html(html: Markup, backend: Optional[str] = None) -> Any:
+    """Parse a page with the configured backend (lxml by default, BeautifulSoup as fallback)."""
+    backend = backend or BACKEND
+    if backend == "lxml" and LXML_AVAILABLE:
+        data = html.encode("utf-8") if isinstance(html, str) else html
+        if not data.strip():
+            return lxml.html.fromstring(b"<html></html>")
+        return lxml.html.fromstring(data)
+    return BeautifulSoup(html, "html.parser")
+
+
+def _is_lxml(node: Any) -> bool:
+    return LXML_AVAILABLE and isinstance(node, etree._Element)
+
+
+class Selector:
+    """A CSS selector compiled once for both backends.
+
+    Matching is descendant-only on either backend, like ``Tag.select``.
+    """
+
+    def __init__(self, css: str) -> None:
+        self.css = css
+        self._bs4 = soupsieve.compile(css)
+        self._xpath = (
+            etree.XPath(HTMLTranslator().css_to_xpath(css, prefix="descendant::")) if LXML_AVAILABLE else None
+        )
+
+    def all(self, node: Any) -> List[Any]:
+        if _is_lxml(node):
+            return self._xpath(node)
+        return self._bs4.select(node)
+
+    def first(self, node: Any) -> Optional[Any]:
+        if _is_lxml(node):
+            found = self._xpath(node)
+            return found[0] if found else None
+        return self._bs4.select_one(node)
+
+
+class SelectorChain:
+    """Fallback cascade: the first selector that matches wins (``a or b or c``)."""
+
+    def __init__(self, *css: str) -> None:
+        self.selectors = [Selector(c) for c in css]
+
+    def all(self, node: Any) -> List[Any]:
+        for selector in self.selectors:
+            found = selector.all(node)
+            if found:
+                return found
+        return []
+
+    def first(self, node: Any) -> Optional[Any]:
+        for selector in self.selectors:
+            found = selector.first(node)
+            if found is not None:
+                return found
+        return None
+
+
+def text(node: Any) -> str:
+    """Stripped text of a node, matching ``Tag.get_text(strip=True)``."""
+    if node is None:
+        return ""
+    if _is_lxml(node):
+        return "".join(part.strip() for part in node.itertext())
+    return node.get_text(strip=True)
+
+
+def attr(node: Any, name: str) -> Optional[str]:
+    if node is None:
+        return None
+    return node.get(name)
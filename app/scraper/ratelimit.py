@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+# Requests per second and burst allowed per host, shared by every process when
+# Redis is available. Per host with e.g. SCRAPER_RATE_WWW_LINKEDIN_COM=2.
+HOST_RATE = float(os.getenv("SCRAPER_HOST_RATE", "5"))
+HOST_BURST = float(os.getenv("SCRAPER_HOST_BURST", "10"))
+# After a 429/503 the concurrency cap is multiplied by this; each success adds 1/cap
+BACKOFF_FACTOR = float(os.getenv("SCRAPER_BACKOFF_FACTOR", "0.5"))
+# Longest Retry-After we honour; past this the host is treated as down for this long
+MAX_RETRY_AFTER = float(os.getenv("SCRAPER_MAX_RETRY_AFTER", "60"))
+
+THROTTLE_STATUSES = {429, 503}
+
+
+def host_rate(host: str) -> float:
+    name = host.upper().replace(".", "_").replace("-", "_")
+    return float(os.getenv(f"SCRAPER_RATE_{name}", HOST_RATE))
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or an HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+# Reserve one token: the bucket may go up to ``burst`` tokens into debt, and the
+# caller sleeps until its token would have been refilled. Past that nothing is
+# reserved and the caller is told how long until a reservation could succeed.
+# Returns {reserved, wait in milliseconds}.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+if tokens - 1 < -burst then
+  return {0, math.ceil((1 - burst - tokens) * 1000 / rate)}
+end
+tokens = tokens - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) * 1000 / rate) + 1000)
+if tokens >= 0 then
+  return {1, 0}
+end
+return {1, math.ceil(-tokens * 1000 / rate)}
+"""
+
+# Hand back a reserved token whose caller gave up waiting for it
+TOKEN_REFUND_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  redis.call('HINCRBYFLOAT', KEYS[1], 'tokens', 1)
+end
+return 0
+"""
+
+
+class TokenBucket:
+    """Per-host token buckets; in Redis (one script call per request) or in this process.
+
+    At most ``burst`` callers wait on reserved tokens at a time; the rest sleep
+    and try again, and a caller cancelled while waiting returns its token, so a
+    burst of abandoned requests doesn't hold up the ones that come after it.
+    """
+
+    def __init__(self, redis=None, burst: float = HOST_BURST) -> None:
+        self.burst = burst
+        self._script = redis.register_script(TOKEN_BUCKET_LUA) if redis is not None else None
+        self._refund_script = redis.register_script(TOKEN_REFUND_LUA) if redis is not None else None
+        self._local: Dict[str, list] = {}
+
+    def _reserve_local(self, host: str, rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        state = self._local.setdefault(host, [self.burst, now])
+        tokens = min(self.burst, state[0] + (now - state[1]) * rate)
+        if tokens - 1 < -self.burst:
+            return False, (1 - self.burst - tokens) / rate
+        tokens -= 1
+        state[0], state[1] = tokens, now
+        return True, 0.0 if tokens >= 0 else -tokens / rate
+
+    async def _reserve(self, host: str, rate: float) -> Tuple[bool, float, bool]:
+        """(reserved, wait, reserved in Redis) for one token of ``host``."""
+        if self._script is not None:
+            try:
+                reserved, wait_ms = await self._script(
+                    keys=[f"ratelimit:{host}"], args=[rate, self.burst, int(time.time() * 1000)]
+                )
+                return bool(int(reserved)), int(wait_ms) / 1000, True
+            except Exception:
+                # Redis went away; keep limiting in this process
+                pass
+        reserved, wait = self._reserve_local(host, rate)
+        return reserved, wait, False
+
+    async def _refund(self, host: str, in_redis: bool) -> None:
+        if in_redis:
+            try:
+                await self._refund_script(keys=[f"ratelimit:{host}"])
+            except Exception:
+                pass
+        elif host in self._local:
+            self._local[host][0] += 1
+
+    async def acquire(self, host: str) -> None:
+        rate = host_rate(host)
+        if rate <= 0:
+            return
+        while True:
+            reserved, wait, in_redis = await self._reserve(host, rate)
+            if reserved and wait <= 0:
+                return
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                if reserved:
+                    await self._refund(host, in_redis)
+                raise
+            if reserved:
+                return
+
+
+class AdaptiveLimit:
+    """AIMD concurrency cap for one host.
+
+    Each successful response raises the cap by ``1/cap`` (about +1 per round of
+    requests) up to ``max_limit``; a 429/503 multiplies it by ``BACKOFF_FACTOR``
+    (at most once per second, so one burst of rejections counts once) and a
+    ``Retry-After`` holds back every request to the host until it has passed.
+    """
+
+    def __init__(self, max_limit: int) -> None:
+        self.max_limit = max_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._last_backoff = 0.0
+        self._changed = asyncio.Condition()
+
+    async def __aenter__(self) -> "AdaptiveLimit":
+        async with self._changed:
+            while True:
+                delay = self.blocked_until - time.monotonic()
+                if delay <= 0 and self.in_flight < int(self.limit):
+                    break
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=delay if delay > 0 else None)
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        async with self._changed:
+            self.in_flight -= 1
+            self._changed.notify_all()
+
+    def observe(self, status_code: int, retry_after: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if status_code in THROTTLE_STATUSES:
+            if now - self._last_backoff >= 1.0:
+                self.limit = max(1.0, self.limit * BACKOFF_FACTOR)
+                self._last_backoff = now
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + min(retry_after, MAX_RETRY_AFTER))
+        elif status_code < 500:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "blocked_for": round(max(0.0, self.blocked_until - time.monotonic()), 1),
+        }
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+# Extra attempts after a transient failure, with full-jitter exponential backoff
+RETRY_ATTEMPTS = int(os.getenv("SCRAPER_RETRIES", "2"))
+RETRY_BASE_DELAY = float(os.getenv("SCRAPER_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("SCRAPER_RETRY_MAX_DELAY", "4"))
+
+# Consecutive failed scrapes that open a source's breaker, and how long it stays
+# open before one probe is let through
+BREAKER_FAILURES = int(os.getenv("SCRAPER_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("SCRAPER_BREAKER_RESET_SECONDS", "30"))
+
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+
+# Event loop time by which the source scrape in progress must finish, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("scrape_deadline", default=None)
+
+
+class ScrapeError(Exception):
+    """A source could not be scraped (as opposed to a search with no results)."""
+
+
+class CircuitOpenError(ScrapeError):
+    pass
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUSES
+    return isinstance(error, httpx.TransportError)
+
+
+async def with_retries(
+    attempt: Callable[[], Awaitable[T]],
+    retries: Optional[int] = None,
+    base_delay: Optional[float] = None,
+    max_delay: Optional[float] = None,
+) -> T:
+    """Call ``attempt`` until it succeeds, retrying transient HTTP errors ``retries`` times.
+
+    Waits a random time up to ``base_delay * 2**n`` (capped at ``max_delay``)
+    before retry ``n``, so clients that failed together don't retry together.
+    A ``Retry-After`` is already waited out by the host's limiter in ``HostPool``.
+    """
+    retries = RETRY_ATTEMPTS if retries is None else retries
+    base_delay = RETRY_BASE_DELAY if base_delay is None else base_delay
+    max_delay = RETRY_MAX_DELAY if max_delay is None else max_delay
+    for retry in range(retries + 1):
+        try:
+            return await attempt()
+        except Exception as e:  # noqa: BLE001
+            if retry == retries or not is_transient(e):
+                raise
+        await asyncio.sleep(random.uniform(0, min(max_delay, base_delay * 2 ** retry)))
+    raise AssertionError("unreachable")
+
+
+@contextlib.contextmanager
+def source_deadline(seconds: float) -> Iterator[None]:
+    """Let ``fetch`` calls made within (and tasks started from) here fit their retries in ``seconds``."""
+    token = _deadline.set(asyncio.get_running_loop().time() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+async def fetch(pool, url: str, **kwargs) -> httpx.Response:
+    """``pool.get`` that raises for error statuses and retries transient failures.
+
+    Under a ``source_deadline`` each attempt's timeout is at most an equal share
+    of the time left, so an attempt that times out still leaves room to retry.
+    """
+    from .http import HTTP_TIMEOUT
+
+    attempts_left = RETRY_ATTEMPTS + 1
+
+    async def _attempt() -> httpx.Response:
+        nonlocal attempts_left
+        attempt_kwargs = kwargs
+        deadline = _deadline.get()
+        if deadline is not None:
+            share = (deadline - asyncio.get_running_loop().time()) / max(1, attempts_left)
+            attempt_kwargs = {**kwargs, "timeout": max(0.0, min(kwargs.get("timeout", HTTP_TIMEOUT), share))}
+        attempts_left -= 1
+        response = await pool.get(url, **attempt_kwargs)
+        response.raise_for_status()
+        return response
+
+    return await with_retries(_attempt)
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failures`` consecutive failures -> half-open after ``reset_seconds``.
+
+    While open every call fails fast. Half-open lets a single probe through: its
+    success closes the breaker, its failure opens it for another ``reset_seconds``.
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, reset_seconds: float = BREAKER_RESET_SECONDS) -> None:
+        self.failure_threshold = failures
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        if self.state == "open":
+            remaining = self.opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(f"circuit open, retrying in {remaining:.0f}s")
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probing:
+                raise CircuitOpenError("circuit half-open, probe in progress")
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def release(self) -> None:
+        """The call was abandoned (cancelled) without an outcome; let another probe through."""
+        self._probing = False
+
+    def snapshot(self) -> dict:
+        retry_in = self.opened_at + self.reset_seconds - time.monotonic() if self.state == "open" else 0
+        return {"state": self.state, "failures": self.failures, "retry_in": round(max(0.0, retry_in), 1)}
+
+
+BREAKERS: Dict[str, CircuitBreaker] = {}
+
+
+def breaker_for(name: str) -> CircuitBreaker:
+    breaker = BREAKERS.get(name)
+    if breaker is None:
+        breaker = CircuitBreaker(BREAKER_FAILURES, BREAKER_RESET_SECONDS)
+        BREAKERS[name] = breaker
+    return breaker
+
+
+def breaker_states() -> Dict[str, dict]:
+    return {name: breaker.snapshot() for name, breaker in BREAKERS.items()}
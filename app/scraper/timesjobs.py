@@ -1,11 +1,23 @@
 import argparse
 import asyncio
+import contextlib
 import csv
+import functools
 import json
-from typing import Dict, List, Optional
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
 
-import httpx
-from bs4 import BeautifulSoup
+if not __package__:
+    # Run as a script (python app/scraper/timesjobs.py): import the app package from the
+    # project root instead of this directory, whose http.py would shadow the stdlib
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scraper.concurrency import first_by_priority, ordered_window
+from app.scraper.http import HostPool, http_pool
+from app.scraper.parsing import SelectorChain, attr, parse_html, text
+from app.scraper.resilience import ScrapeError, fetch
+from app.scraper.workers import run_parser
 
 
 DEFAULT_HEADERS = {
@@ -19,11 +31,9 @@ DEFAULT_HEADERS = {
     "Referer": "https://www.timesjobs.com/",
 }
 
-
-def _first_text(el) -> str:
-    if not el:
-        return ""
-    return el.get_text(strip=True)
+SEARCH_URL = "https://www.timesjobs.com/candidate/job-search.html"
+MAX_PAGES = 5
+PAGE_WINDOW = int(os.getenv("TIMESJOBS_PAGE_WINDOW", "3"))
 
 
 def _normalize_url(href: Optional[str]) -> str:
@@ -34,34 +44,24 @@ def _normalize_url(href: Optional[str]) -> str:
     return f"https://www.timesjobs.com{href}"
 
 
+# Compiled once; the "or" cascades from the original select_one chains
+CARDS = SelectorChain("li.clearfix.job-bx, div.job-bx", ".job-bx", "article")
+TITLE = SelectorChain("h2 a", "header h2 a", ".job-bx h2 a", "a[href*='jobid']")
+COMPANY = SelectorChain("h3 .joblist-comp-name", ".joblist-comp-name", ".comp-name", "span.company")
+LOCATION = SelectorChain("ul.top-jd-dtl li span.loc", "span.location", "i.hiring_loc + span", ".job-location")
+
+
 def _extract_card(card) -> Dict[str, str]:
-    title_el = (
-        card.select_one("h2 a")
-        or card.select_one("header h2 a")
-        or card.select_one(".job-bx h2 a")
-        or card.select_one("a[href*='jobid']")
-    )
-    title = _first_text(title_el)
-    url = _normalize_url(title_el.get("href") if title_el else "")
+    title_el = TITLE.first(card)
+    title = text(title_el)
+    url = _normalize_url(attr(title_el, "href"))
 
     # Company
-    company_el = (
-        card.select_one("h3 .joblist-comp-name")
-        or card.select_one(".joblist-comp-name")
-        or card.select_one(".comp-name")
-        or card.select_one("span.company")
-    )
-    company_text = _first_text(company_el)
+    company_text = text(COMPANY.first(card))
     # TimesJobs often includes trailing "(More Jobs)" text, strip it
     company = company_text.replace("(More Jobs)", "").strip() or "Unknown Company"
 
-    location_el = (
-        card.select_one("ul.top-jd-dtl li span.loc")
-        or card.select_one("span.location")
-        or card.select_one("i.hiring_loc + span")
-        or card.select_one(".job-location")
-    )
-    location = _first_text(location_el) or "Remote"
+    location = text(LOCATION.first(card)) or "Remote"
 
     return {
         "title": title,
@@ -71,84 +71,107 @@ def _extract_card(card) -> Dict[str, str]:
     }
 
 
-async def _fetch_html(client: httpx.AsyncClient, params: dict) -> Optional[str]:
-    try:
-        resp = await client.get("https://www.timesjobs.com/candidate/job-search.html", params=params)
-        resp.raise_for_status()
-        return resp.text
-    except Exception:
-        return None
-
-
-async def scrape_timesjobs(query: str = "python developer", location: str = "remote", limit: int = 10) -> List[Dict[str, str]]:
-    """Scrape TimesJobs listings and return normalized results."""
-    results: List[Dict[str, str]] = []
-    async with httpx.AsyncClient(headers=DEFAULT_HEADERS, follow_redirects=True, timeout=15.0) as client:
-        # Try a few pagination parameter patterns used on TimesJobs
-        page = 1
-        while len(results) < limit and page <= 5:
-            params = {
-                "searchType": "Home_Search",
-                "from": "submit",
-                "txtKeywords": query,
-                "txtLocation": location,
-                "sequence": page,
-            }
-            html = await _fetch_html(client, params)
-            if not html and page == 1:
-                # Try alternate parameter names
-                params_alt = {
-                    "searchType": "Home_Search",
-                    "from": "submit",
-                    "txtKeywords": query,
-                    "txtLocation": location,
-                    "curPg": page,
-                }
-                html = await _fetch_html(client, params_alt)
-            
-            if not html and page == 1:
-                # Try without location parameter
-                params_no_loc = {
-                    "searchType": "Home_Search",
-                    "from": "submit",
-                    "txtKeywords": query,
-                    "sequence": page,
-                }
-                html = await _fetch_html(client, params_no_loc)
-
-            if not html:
-                break
-
-            soup = BeautifulSoup(html, "html.parser")
-            cards = (
-                soup.select("li.clearfix.job-bx, div.job-bx")
-                or soup.select(".job-bx")
-                or soup.select("article")
-                or []
-            )
-
-            if not cards:
-                break
-
-            for card in cards:
+async def _fetch_html(pool: HostPool, params: dict) -> bytes:
+    resp = await fetch(pool, SEARCH_URL, params=params, headers=DEFAULT_HEADERS)
+    return resp.content
+
+
+def _search_params(query: str, location: str, page: int, page_key: str = "sequence", with_location: bool = True) -> dict:
+    params = {
+        "searchType": "Home_Search",
+        "from": "submit",
+        "txtKeywords": query,
+    }
+    if with_location:
+        params["txtLocation"] = location
+    params[page_key] = page
+    return params
+
+
+def _parse_page(html: bytes) -> List[Tuple[str, str, str, str]]:
+    """Return ``(title, company, location, url)`` per card; runs in the parse pool."""
+    rows: List[Tuple[str, str, str, str]] = []
+    for card in CARDS.all(parse_html(html)):
+        data = _extract_card(card)
+        if data.get("title") and data.get("url"):
+            rows.append((data["title"], data["company"], data["location"], data["url"]))
+    return rows
+
+
+def _to_job(row: Tuple[str, str, str, str]) -> Dict[str, str]:
+    title, company, location, url = row
+    return {
+        "title": title,
+        "company": company,
+        "location": location,
+        "description": "",
+        "url": url,
+        "liked": False,
+        "applied": False,
+        "source": "TimesJobs",
+    }
+
+
+async def scrape_timesjobs(
+    query: str = "python developer",
+    location: str = "remote",
+    limit: int = 10,
+    page_window: int = PAGE_WINDOW,
+) -> List[Dict[str, str]]:
+    """Scrape TimesJobs listings and return normalized results.
+
+    Page 1 requests the known parameter variants at once and uses the first one,
+    in priority order, that returns cards: the search without a location is only
+    used when both located variants failed or came back empty. The remaining pages
+    needed for ``limit`` are then fetched ``page_window`` at a time and consumed in
+    page order. Raises ``ScrapeError`` when every page-1 variant fails.
+    """
+    async with http_pool() as pool:
+        # Try a few pagination parameter patterns used on TimesJobs, best first
+        variants = [
+            _search_params(query, location, 1),
+            _search_params(query, location, 1, page_key="curPg"),
+            _search_params(query, location, 1, with_location=False),
+        ]
+        errors: List[Exception] = []
+
+        async def _attempt(params: dict) -> List[Tuple[str, str, str, str]]:
+            try:
+                html = await _fetch_html(pool, params)
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+                raise
+            return await run_parser(_parse_page, html)
+
+        rows = await first_by_priority(functools.partial(_attempt, params) for params in variants)
+        if not rows:
+            if len(errors) == len(variants):
+                raise ScrapeError(f"TimesJobs search failed: {errors[-1]}")
+            return []
+
+        results = [_to_job(row) for row in rows]
+        if len(results) >= limit:
+            return results[:limit]
+
+        # Don't keep more pages in flight than the first page's size says we need
+        pages_needed = -(-(limit - len(results)) // len(results))
+        window = max(1, min(page_window, pages_needed))
+
+        async def _fetch_page(page: int) -> Optional[bytes]:
+            try:
+                return await _fetch_html(pool, _search_params(query, location, page))
+            except Exception:  # noqa: BLE001
+                # Keep the pages already read; paging stops at the first gap
+                return None
+
+        async with contextlib.aclosing(ordered_window(_fetch_page, range(2, MAX_PAGES + 1), window)) as pages:
+            async for _, page_html in pages:
+                rows = await run_parser(_parse_page, page_html) if page_html else []
+                if not rows:
+                    break
+                results.extend(_to_job(row) for row in rows)
                 if len(results) >= limit:
                     break
-                data = _extract_card(card)
-                if data.get("title") and data.get("url"):
-                    results.append(
-                        {
-                            "title": data["title"],
-                            "company": data["company"],
-                            "location": data["location"],
-                            "description": "",
-                            "url": data["url"],
-                            "liked": False,
-                            "applied": False,
-                            "source": "TimesJobs",
-                        }
-                    )
-
-            page += 1
 
     return results[:limit]
 
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# "process" spreads parsing across cores, "thread" suits parsers that release the
+# GIL (lxml does while building the tree), "inline" parses on the event loop.
+PARSE_EXECUTOR = os.getenv("SCRAPER_PARSE_EXECUTOR", "process").lower()
+PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_executor: Optional[Executor] = None
+
+
+def build_parse_executor(kind: str = PARSE_EXECUTOR, workers: int = PARSE_WORKERS) -> Optional[Executor]:
+    if kind == "inline" or workers <= 0:
+        return None
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-parse")
+    # spawn avoids forking a process that already runs an event loop and threads
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+async def init_parse_pool(app, kind: str = PARSE_EXECUTOR, workers: int = PARSE_WORKERS) -> None:
+    global _executor
+    _executor = build_parse_executor(kind, workers)
+    app.state.parse_pool = _executor
+
+
+async def close_parse_pool(app) -> None:
+    global _executor
+    executor = getattr(app.state, "parse_pool", None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    app.state.parse_pool = None
+    _executor = None
+
+
+async def run_parser(fn: Callable[..., T], *args: Any) -> T:
+    """Run a module-level parse function off the event loop when a pool is configured.
+
+    Parse functions take raw HTML bytes and return plain tuples, so both cross
+    the process boundary cheaply. Without a pool (CLI, tests) they run inline.
+    """
+    if _executor is None:
+        return fn(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, fn, *args)
@@ -0,0 +1,112 @@
+import re
+
+from sqlalchemy import column, func, literal_column, table, text
+
+from app.models import Job
+
+# Postgres keeps a weighted tsvector as a generated column (so inserts and updates
+# maintain it) behind a GIN index; pg_trgm indexes serve the substring filters on
+# company/location. SQLite gets an external-content FTS5 table kept in sync by
+# triggers, so search can be exercised locally without Postgres.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+POSTGRES_TRGM_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_company_trgm ON jobs USING GIN (company gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_location_trgm ON jobs USING GIN (location gin_trgm_ops)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, description, content='jobs', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, company, description)
+        VALUES (new.id, new.title, new.company, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, old.company, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, old.company, old.description);
+        INSERT INTO jobs_fts(rowid, title, company, description)
+        VALUES (new.id, new.title, new.company, new.description);
+    END
+    """,
+]
+
+jobs_fts = table("jobs_fts", column("rowid"))
+
+
+async def ensure_search_index(conn) -> None:
+    """Create the full-text search structures for the connection's dialect (idempotent)."""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        for ddl in POSTGRES_SEARCH_DDL:
+            await conn.execute(text(ddl))
+        try:
+            # pg_trgm may not be installable by this role; search works without it
+            async with conn.begin_nested():
+                for ddl in POSTGRES_TRGM_DDL:
+                    await conn.execute(text(ddl))
+        except Exception:
+            pass
+    elif dialect == "sqlite":
+        existing = await conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'"))
+        created = existing.first() is None
+        for ddl in SQLITE_SEARCH_DDL:
+            await conn.execute(text(ddl))
+        if created:
+            await conn.execute(text("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')"))
+
+
+def search_terms(search: str):
+    return re.findall(r"\w+", (search or "").lower())
+
+
+def apply_search(query, dialect: str, search: str):
+    """Restrict ``query`` to jobs matching ``search`` and return ``(query, rank)``.
+
+    Every word must match as a prefix of a word in title, company or description.
+    ``rank`` is a relevance score where higher is better (order by ``rank.desc()``),
+    or ``None`` when the dialect has no full-text support and the ILIKE fallback is used.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return query, None
+
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column("jobs.search_vector")
+        return query.where(vector.op("@@")(tsquery)), func.ts_rank_cd(vector, tsquery)
+
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        query = query.join(jobs_fts, jobs_fts.c.rowid == Job.id).where(literal_column("jobs_fts").op("MATCH")(match))
+        # bm25 scores lower-is-better, so negate it; weight title > company > description like Postgres
+        return query, -func.bm25(literal_column("jobs_fts"), 10.0, 5.0, 1.0)
+
+    return query.where(
+        Job.title.ilike(f"%{search}%") |
+        Job.company.ilike(f"%{search}%") |
+        Job.description.ilike(f"%{search}%")
+    ), None
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import math
+import mmap
+import os
+import tempfile
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows; one process per filter file there
+    fcntl = None  # type: ignore
+
+from app.normalize import normalize_url
+
+# Sized for this many stored jobs at this false-positive rate (about 1.8 MB of bits)
+SEEN_FILTER_CAPACITY = int(os.getenv("SEEN_FILTER_CAPACITY", "1000000"))
+SEEN_FILTER_ERROR_RATE = float(os.getenv("SEEN_FILTER_ERROR_RATE", "0.001"))
+# Optional file the bits are memory-mapped from; shared by the workers on one
+# host and reused across restarts (delete it to rebuild from the database)
+SEEN_FILTER_PATH = os.getenv("SEEN_FILTER_PATH", "")
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, in memory or backed by an mmap'd file.
+
+    ``key in bloom`` is never wrong for added keys and wrong for others with
+    probability about ``error_rate`` while at most ``capacity`` keys are stored.
+
+    A file-backed filter either opens the complete filter already at ``path``
+    (``loaded``) or is built in a private temporary file that ``publish`` moves
+    into place, so a file at ``path`` is never half-built. Writers sharing the
+    file take an exclusive ``flock`` around each batch of additions, because
+    setting a bit is a read-modify-write of its byte.
+    """
+
+    def __init__(self, capacity: int = SEEN_FILTER_CAPACITY, error_rate: float = SEEN_FILTER_ERROR_RATE, path: str = "") -> None:
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.nbytes = (self.size + 7) // 8
+        self.path = path
+        self.loaded = False
+        self._file = None
+        self._building = None
+        if path:
+            self.loaded = os.path.exists(path) and os.path.getsize(path) == self.nbytes
+            if self.loaded:
+                self._file = open(path, "r+b")
+            else:
+                directory, name = os.path.split(os.path.abspath(path))
+                fd, self._building = tempfile.mkstemp(prefix=f"{name}.", suffix=".tmp", dir=directory)
+                self._file = os.fdopen(fd, "w+b")
+                self._file.truncate(self.nbytes)
+            self.bits = mmap.mmap(self._file.fileno(), self.nbytes)
+        else:
+            self.bits = bytearray(self.nbytes)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    @contextlib.contextmanager
+    def _locked(self):
+        if self._file is None or fcntl is None:
+            yield
+            return
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        with self._locked():
+            for key in keys:
+                for position in self._positions(key):
+                    self.bits[position >> 3] |= 1 << (position & 7)
+
+    def add(self, key: str) -> None:
+        self.add_many((key,))
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def publish(self) -> None:
+        """Move a freshly built filter file to ``path``; a no-op unless it is being built.
+
+        If another process published first, this filter's bits are OR'ed into that
+        file and it is used from then on, so both keep sharing one set of bits.
+        """
+        if self._building is None:
+            return
+        self.bits.flush()
+        try:
+            # Unlike a rename, a link never replaces a file someone else published
+            os.link(self._building, self.path)
+        except FileExistsError:
+            if os.path.getsize(self.path) != self.nbytes:
+                # Left over from a different capacity/error rate
+                os.replace(self._building, self.path)
+                self._building = None
+                self.loaded = True
+                return
+            private_file, private_bits = self._file, self.bits
+            self._file = open(self.path, "r+b")
+            self.bits = mmap.mmap(self._file.fileno(), self.nbytes)
+            with self._locked():
+                merged = int.from_bytes(self.bits[:], "big") | int.from_bytes(private_bits[:], "big")
+                self.bits[:] = merged.to_bytes(self.nbytes, "big")
+            private_bits.close()
+            private_file.close()
+        os.unlink(self._building)
+        self._building = None
+        self.loaded = True
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.bits.flush()
+            self.bits.close()
+            self._file.close()
+            self._file = None
+        if self._building is not None:
+            # Never published (the build failed): don't leave the partial file behind
+            os.unlink(self._building)
+            self._building = None
+
+
+_seen: Optional[BloomFilter] = None
+
+
+async def init_seen(app, path: str = SEEN_FILTER_PATH, engine=None) -> None:
+    """Build the seen-URL filter from the stored jobs' ``url_key`` values (or reuse ``path``)."""
+    global _seen
+    from sqlalchemy import select
+    from sqlalchemy.exc import DBAPIError
+
+    from app.models import Job
+
+    if engine is None:
+        from app.db import engine
+
+    bloom = BloomFilter(path=path)
+    if not bloom.loaded:
+        try:
+            async with engine.connect() as conn:
+                result = await conn.stream(
+                    select(Job.url_key).where(Job.url_key.isnot(None)).execution_options(yield_per=10000)
+                )
+                async for keys in result.scalars().partitions():
+                    bloom.add_many(keys)
+        except DBAPIError as e:
+            # jobs or its url_key column missing: migrate_db.py has not been run yet.
+            # Start empty (new_only then drops nothing) and don't publish the file,
+            # so the next start builds it from the migrated table
+            logger.warning("Seen-URL filter starts empty, could not read stored job URLs: %s", e)
+        else:
+            bloom.publish()
+    _seen = bloom
+    app.state.seen = bloom
+
+
+async def close_seen(app) -> None:
+    global _seen
+    bloom = getattr(app.state, "seen", None)
+    if bloom is not None:
+        bloom.close()
+    app.state.seen = None
+    _seen = None
+
+
+def mark_seen(url_keys: Iterable[str]) -> None:
+    if _seen is None:
+        return
+    _seen.add_many(key for key in url_keys if key)
+
+
+def is_seen(url: str) -> bool:
+    """True when a job with this URL is (very probably) stored already; False without a filter."""
+    if _seen is None or not url:
+        return False
+    return normalize_url(url) in _seen
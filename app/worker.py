@@ -0,0 +1,132 @@
+"""Background scrape worker: runs queued scrapes and the saved-search schedule.
+
+Usage: python -m app.worker
+
+Any number of workers can run against the same database; tasks are claimed
+from the ``scrape_tasks`` table (see ``app.crud.claim_tasks``). Results are
+written to the jobs table and, when Redis is configured, each source's results
+are cached for ``/scrape`` to reuse.
+"""
+import asyncio
+import logging
+import os
+import types
+from typing import Optional, Set
+
+from app.crud import claim_tasks, enqueue_due_searches, finish_task
+
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "2"))
+WORKER_POLL_SECONDS = float(os.getenv("WORKER_POLL_SECONDS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+async def run_task(app, task: dict) -> None:
+    from app.scraper import aggregate_jobs
+
+    report = {}
+    try:
+        jobs = await aggregate_jobs(
+            query=task["query"],
+            location=task["location"],
+            limit=task["limit"],
+            sources=task["sources"],
+            report=report,
+            persist=True,
+            app=app,
+        )
+    except Exception as e:  # noqa: BLE001
+        await finish_task(task["task_id"], task["attempts"], error=str(e) or type(e).__name__)
+        return
+    persisted = report.pop("persisted", None)
+    # If this run outlived its lease and the task was claimed again, the newer claim's outcome wins
+    await finish_task(task["task_id"], task["attempts"], result={
+        "total_jobs": len(jobs),
+        "persisted": persisted,
+        "source_status": report,
+    })
+
+
+async def work(
+    app,
+    concurrency: int = WORKER_CONCURRENCY,
+    poll_seconds: float = WORKER_POLL_SECONDS,
+    stop: Optional[asyncio.Event] = None,
+) -> None:
+    """Keep up to ``concurrency`` tasks running until ``stop`` is set.
+
+    Each round queues due saved searches, claims as many tasks as there are free
+    slots, then waits for a task to finish or ``poll_seconds`` to pass. A round
+    that fails (e.g. the database is restarting) is logged and retried after
+    ``poll_seconds``; tasks already running carry on meanwhile.
+    """
+    stop = stop or asyncio.Event()
+    running: Set[asyncio.Future] = set()
+
+    async def _idle() -> None:
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    try:
+        while not stop.is_set():
+            try:
+                await enqueue_due_searches()
+                free = concurrency - len(running)
+                if free > 0:
+                    for task in await claim_tasks(free):
+                        running.add(asyncio.ensure_future(run_task(app, task)))
+            except Exception:  # noqa: BLE001
+                logger.exception("Worker poll failed, retrying in %ss", poll_seconds)
+                await _idle()
+                running = {task for task in running if not _reap(task)}
+                continue
+            if running:
+                done, running = await asyncio.wait(running, timeout=poll_seconds, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    _reap(task)
+            else:
+                await _idle()
+    finally:
+        # Unfinished tasks stay "running" and are picked up again once their lease expires
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+def _reap(task: asyncio.Future) -> bool:
+    """True once ``task`` is done; logs it if it failed to record its own outcome."""
+    if not task.done():
+        return False
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Scrape task failed", exc_info=task.exception())
+    return True
+
+
+async def main() -> None:
+    from app.cache import close_cache, init_cache
+    from app.db import engine
+    from app.models import Base
+    from app.scraper.http import close_http, init_http
+    from app.scraper.workers import close_parse_pool, init_parse_pool
+    from app.seen import close_seen, init_seen
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    app = types.SimpleNamespace(state=types.SimpleNamespace())
+    await init_seen(app)
+    await init_cache(app)
+    await init_http(app)
+    await init_parse_pool(app)
+    try:
+        await work(app)
+    finally:
+        await close_parse_pool(app)
+        await close_http(app)
+        await close_cache(app)
+        await close_seen(app)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""Per-job saves vs. save_jobs_bulk for one scrape's worth of jobs.
+
+Usage: python -m benchmarks.bench_bulk_ingest [--url sqlite+aiosqlite:///bench_ingest.sqlite3] [--jobs 100]
+The jobs table in --url is dropped and recreated.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.crud as crud
+from app.models import Base, Job
+
+
+def _jobs(count: int, run: int):
+    return [
+        {
+            "title": f"Engineer {i}",
+            "company": f"Company {i}",
+            "location": "Pune",
+            "description": "",
+            "url": f"https://www.linkedin.com/jobs/view/{run}{i:06d}/?refId=x",
+            "source": "LinkedIn",
+        }
+        for i in range(count)
+    ]
+
+
+async def legacy_save_job(job_data: dict):
+    # The pre-bulk path: one session, commit and refresh per job
+    async with crud.AsyncSessionLocal() as session:
+        job = Job(**job_data)
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+    return job.id
+
+
+async def _timed(label: str, coro_factory, rounds: int) -> float:
+    timings = []
+    for run in range(rounds):
+        started = time.perf_counter()
+        await coro_factory(run)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f"{label:<28} {best * 1000:>9.1f} ms")
+    return best
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///bench_ingest.sqlite3")
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    crud.AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def per_job_legacy(run):
+        for job in _jobs(args.jobs, 10 + run):
+            await legacy_save_job(job)
+
+    async def per_job_upsert(run):
+        for job in _jobs(args.jobs, 20 + run):
+            await crud.save_job(job)
+
+    async def bulk(run):
+        await crud.save_jobs_bulk(_jobs(args.jobs, 30 + run))
+
+    async def bulk_resave(run):
+        await crud.save_jobs_bulk(_jobs(args.jobs, 30 + run))
+
+    print(f"Saving {args.jobs} jobs ({engine.dialect.name})")
+    legacy = await _timed("per-job (legacy insert)", per_job_legacy, args.rounds)
+    await _timed("per-job (save_job upsert)", per_job_upsert, args.rounds)
+    fast = await _timed("save_jobs_bulk (new)", bulk, args.rounds)
+    await _timed("save_jobs_bulk (re-save)", bulk_resave, args.rounds)
+    print(f"bulk speedup vs legacy: {legacy / fast:.1f}x")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
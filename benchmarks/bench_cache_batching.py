@@ -0,0 +1,74 @@
+"""Per-key get_cache/set_cache vs. batched get_many/set_many.
+
+Usage: python -m benchmarks.bench_cache_batching [--url redis://localhost:6379/15] [--rtt-ms 0.5]
+Without --url (or without the redis package) Redis is simulated: every command
+or pipeline execution costs one --rtt-ms round trip. With --url the keys
+bench:* in that database are overwritten.
+"""
+import argparse
+import asyncio
+import time
+import types
+
+from app import cache as cache_mod
+from tests.fakes import FakeRedis
+
+
+def _app(client):
+    # No local tier: measure Redis traffic only
+    return types.SimpleNamespace(state=types.SimpleNamespace(redis=client, local_cache=None))
+
+
+async def _timed(coro) -> float:
+    started = time.perf_counter()
+    await coro
+    return (time.perf_counter() - started) * 1000
+
+
+async def _per_key_set(app, items):
+    for key, value in items.items():
+        await cache_mod.set_cache(app, key, value, ttl_seconds=60)
+
+
+async def _per_key_get(app, keys):
+    for key in keys:
+        await cache_mod.get_cache(app, key)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    if args.url and cache_mod.redis is not None:
+        client = cache_mod.redis.from_url(args.url, decode_responses=False)
+        counted = None
+        print(f"redis at {args.url}")
+    else:
+        client = counted = FakeRedis(rtt=args.rtt_ms / 1000)
+        print(f"simulated redis, {args.rtt_ms} ms per round trip")
+    app = _app(client)
+
+    print(f"{'keys':>6} {'op':<4} {'per-key ms':>11} {'batched ms':>11} {'round trips':>14}")
+    for count in (10, 100, 1000):
+        items = {f"bench:{count}:{i}": {"source": "linkedin", "jobs": [{"title": f"Job {i}"}]} for i in range(count)}
+        keys = list(items)
+        for op, single, batched in (
+            ("set", _per_key_set(app, items), cache_mod.set_many(app, items, ttl_seconds=60)),
+            ("get", _per_key_get(app, keys), cache_mod.get_many(app, keys)),
+        ):
+            before = counted.round_trips if counted else 0
+            single_ms = await _timed(single)
+            middle = counted.round_trips if counted else 0
+            batched_ms = await _timed(batched)
+            after = counted.round_trips if counted else 0
+            trips = f"{middle - before} -> {after - middle}" if counted else "n/a"
+            print(f"{count:>6} {op:<4} {single_ms:>11.1f} {batched_ms:>11.1f} {trips:>14}")
+
+    if counted is None:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
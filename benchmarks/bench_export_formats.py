@@ -0,0 +1,67 @@
+"""Size and pandas load time of the CSV export vs. the Parquet / Arrow exports.
+
+Usage: python -m benchmarks.bench_export_formats [--url sqlite+aiosqlite:///bench_export.sqlite3] [--rows 200000]
+The jobs table in --url is dropped and recreated.
+"""
+import argparse
+import asyncio
+import io
+import time
+
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.crud as crud
+from app.columnar import stream_jobs_columnar
+from app.models import Base, Job
+from benchmarks.bench_indexes import _rows
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///bench_export.sqlite3")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    for start in range(0, args.rows, 20_000):
+        rows = _rows(start, min(20_000, args.rows - start), pd.Timestamp("2024-01-01").to_pydatetime())
+        for row in rows:
+            row["applied"] = True
+        async with engine.begin() as conn:
+            await conn.execute(Job.__table__.insert(), rows)
+    crud.AsyncSessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    loaders = {
+        "csv": lambda data: pd.read_csv(io.BytesIO(data)),
+        "parquet": lambda data: pd.read_parquet(io.BytesIO(data)),
+        "arrow": lambda data: pa.ipc.open_stream(data).read_pandas(),
+    }
+    print(f"{args.rows} rows ({engine.dialect.name})")
+    print(f"{'format':<8} {'MB':>8} {'export s':>9} {'load s':>8}")
+    for name, load in loaders.items():
+        started = time.perf_counter()
+        if name == "csv":
+            data = await _collect(crud.stream_applied_jobs(format="csv", chunk_rows=5000))
+        else:
+            data = await _collect(stream_jobs_columnar(format=name))
+        exported = time.perf_counter() - started
+        started = time.perf_counter()
+        frame = load(data)
+        loaded = time.perf_counter() - started
+        assert len(frame) == args.rows
+        print(f"{name:<8} {len(data) / 1e6:>8.2f} {exported:>9.2f} {loaded:>8.3f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""Query plans and latency of the /saved and export queries with and without the Job indexes.
+
+Fills a scratch database with synthetic jobs, then runs each query before and after
+creating the model's composite/partial indexes.
+
+Usage: python -m benchmarks.bench_indexes [--url postgresql+asyncpg://.../jobbench] [--rows 1000000]
+Defaults to a throwaway SQLite file. The jobs table in --url is dropped and recreated.
+"""
+import argparse
+import asyncio
+import datetime
+import random
+import time
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.future import select
+
+from app.models import Base, Job
+
+SOURCES = ["LinkedIn", "CareerJet", "TimesJobs"]
+
+QUERIES = {
+    "saved newest page": select(Job).order_by(Job.created_at.desc(), Job.id.desc()).limit(10),
+    "saved liked=true": select(Job).where(Job.liked == True).order_by(Job.created_at.desc(), Job.id.desc()).limit(10),  # noqa: E712
+    "saved applied=false deep": select(Job).where(Job.applied == False).order_by(Job.created_at.desc(), Job.id.desc()).offset(5000).limit(10),  # noqa: E712
+    "saved source=linkedin": select(Job).where(func.lower(Job.source) == "linkedin").order_by(Job.created_at.desc(), Job.id.desc()).limit(10),
+    "export applied": select(Job).where(Job.applied == True).order_by(Job.created_at.desc()),  # noqa: E712
+}
+
+
+def _rows(start: int, count: int, base: datetime.datetime):
+    rnd = random.Random(start)
+    return [
+        {
+            "title": f"Engineer {i}",
+            "company": f"Company {i % 5000}",
+            "location": "Pune",
+            "description": "",
+            "url": f"https://example.com/jobs/{i}",
+            "source": SOURCES[i % 3],
+            "liked": rnd.random() < 0.05,
+            "applied": rnd.random() < 0.01,
+            "created_at": base + datetime.timedelta(seconds=i * 30),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+async def _populate(engine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(lambda c: Job.__table__.create(c))
+        # Leave only the primary key index; the benchmark adds the others later
+        for index in Job.__table__.indexes:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    base = datetime.datetime(2024, 1, 1)
+    chunk = 20_000
+    for start in range(0, rows, chunk):
+        async with engine.begin() as conn:
+            await conn.execute(Job.__table__.insert(), _rows(start, min(chunk, rows - start), base))
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+
+async def _measure(engine, label: str, rounds: int) -> None:
+    dialect = engine.dialect.name
+    compile_dialect = postgresql.dialect() if dialect == "postgresql" else sqlite.dialect()
+    print(f"\n== {label} ==")
+    async with engine.connect() as conn:
+        for name, query in QUERIES.items():
+            sql = str(query.compile(dialect=compile_dialect, compile_kwargs={"literal_binds": True}))
+            explain = "EXPLAIN " if dialect == "postgresql" else "EXPLAIN QUERY PLAN "
+            plan = (await conn.execute(text(explain + sql))).fetchall()
+            timings = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                (await conn.execute(query)).fetchall()
+                timings.append(time.perf_counter() - started)
+            plan_text = " | ".join(str(row[-1]) for row in plan[:3])
+            print(f"{name:<26} {min(timings) * 1000:>9.2f} ms   {plan_text}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///bench_indexes.sqlite3")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    try:
+        await _populate(engine, args.rows)
+        await _measure(engine, f"{args.rows} rows, primary key only", args.rounds)
+        async with engine.begin() as conn:
+            for index in Job.__table__.indexes:
+                await conn.run_sync(lambda c, index=index: index.create(c, checkfirst=True))
+            await conn.execute(text("ANALYZE"))
+        await _measure(engine, f"{args.rows} rows, with Job indexes", args.rounds)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
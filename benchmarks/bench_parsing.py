@@ -0,0 +1,72 @@
+"""Parse time per results page for each scraper and parser backend.
+
+Usage: python -m benchmarks.bench_parsing [--cards 25] [--rounds 50]
+"""
+import argparse
+import time
+
+from app.scraper import careerjet, linkedin, parsing, timesjobs
+
+
+def linkedin_page(cards: int) -> bytes:
+    body = "".join(
+        f'<li><div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:{i}">'
+        f'<a class="base-card__full-link" href="https://in.linkedin.com/jobs/view/{i}?refId=abc&trackingId=def"></a>'
+        f'<div class="base-search-card__info"><h3 class="base-search-card__title"> Python Developer {i} </h3>'
+        f'<h4 class="base-search-card__subtitle"><a href="/company/{i}">Company {i}</a></h4>'
+        f'<div class="base-search-card__metadata"><span class="job-search-card__location">Pune, India</span>'
+        f'<time datetime="2025-01-01">1 day ago</time></div></div></div></li>'
+        for i in range(cards)
+    )
+    return f"<html><head><title>Jobs</title></head><body><ul>{body}</ul></body></html>".encode()
+
+
+def careerjet_page(cards: int) -> bytes:
+    body = "".join(
+        f'<article class="job clicky" data-url="/jobad/{i}"><header><h2><a href="/jobad/{i}" title="Job {i}">'
+        f'Backend Engineer {i}</a></h2></header><p class="company"><a href="/c/{i}">Company {i}</a></p>'
+        f'<ul class="location"><li>Pune</li></ul><div class="desc">Lorem ipsum dolor sit amet {i}</div></article>'
+        for i in range(cards)
+    )
+    return f"<html><body><section><ul class='jobs'>{body}</ul></section></body></html>".encode()
+
+
+def timesjobs_page(cards: int) -> bytes:
+    body = "".join(
+        f'<li class="clearfix job-bx wht-shd-bx"><header class="clearfix"><h2><a href="https://www.timesjobs.com/job-detail/{i}?jobid={i}">'
+        f'Data Engineer {i}</a></h2><h3 class="joblist-comp-name">Company {i} (More Jobs)</h3></header>'
+        f'<ul class="top-jd-dtl clearfix"><li><i class="srp-icons experience"></i>2 - 5 yrs</li>'
+        f'<li><i class="srp-icons location"></i><span class="loc" title="Pune">Pune</span></li></ul></li>'
+        for i in range(cards)
+    )
+    return f"<html><body><ul class='new-joblist'>{body}</ul></body></html>".encode()
+
+
+SCRAPERS = {
+    "linkedin": (linkedin_page, linkedin._parse_cards),
+    "careerjet": (careerjet_page, lambda html: careerjet._parse_cards(html, 10_000)),
+    "timesjobs": (timesjobs_page, timesjobs._parse_page),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=25, help="Cards per synthetic page")
+    parser.add_argument("--rounds", type=int, default=50, help="Pages parsed per measurement")
+    args = parser.parse_args()
+
+    print(f"{'source':<10} {'backend':<8} {'ms/page':>9} {'cards':>6}")
+    for name, (make_page, parse) in SCRAPERS.items():
+        page = make_page(args.cards)
+        for backend in parsing.BACKENDS:
+            parsing.BACKEND = backend
+            found = len(parse(page))
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                parse(page)
+            elapsed = (time.perf_counter() - start) / args.rounds
+            print(f"{name:<10} {backend:<8} {elapsed * 1000:>9.2f} {found:>6}")
+
+
+if __name__ == "__main__":
+    main()
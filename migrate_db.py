@@ -6,8 +6,32 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.db import engine
+from app.models import Job, SavedSearch, ScrapeTask
+from app.normalize import normalize_url
+from app.search import ensure_search_index
 from sqlalchemy import text
 
+async def create_missing_indexes(conn):
+    """Create the Job model's indexes that an older table does not have yet"""
+    for index in Job.__table__.indexes:
+        await conn.run_sync(lambda sync_conn, index=index: index.create(sync_conn, checkfirst=True))
+
+
+async def backfill_url_keys(conn):
+    """Fill url_key for rows saved before upserts; older duplicates of a URL keep NULL"""
+    result = await conn.execute(text("SELECT url_key FROM jobs WHERE url_key IS NOT NULL"))
+    taken = {row[0] for row in result}
+    result = await conn.execute(text("SELECT id, url FROM jobs WHERE url_key IS NULL ORDER BY id"))
+    updates = []
+    for job_id, url in result:
+        key = normalize_url(url or "")
+        if key and key not in taken:
+            taken.add(key)
+            updates.append({"id": job_id, "url_key": key})
+    if updates:
+        await conn.execute(text("UPDATE jobs SET url_key = :url_key WHERE id = :id"), updates)
+
+
 async def migrate_database():
     """Add missing columns to database"""
     try:
@@ -26,12 +50,33 @@ async def migrate_database():
                     ADD COLUMN source VARCHAR DEFAULT 'Unknown'
                 """))
             
+            # Normalized URL used by the bulk upsert
+            result = await conn.execute(text("""
+                SELECT column_name 
+                FROM information_schema.columns 
+                WHERE table_name = 'jobs' AND column_name = 'url_key'
+            """))
+            if not result.fetchone():
+                await conn.execute(text("ALTER TABLE jobs ADD COLUMN url_key VARCHAR"))
+            await backfill_url_keys(conn)
+
             # Check if all required columns exist
             result = await conn.execute(text("""
                 SELECT column_name 
                 FROM information_schema.columns 
                 WHERE table_name = 'jobs'
             """))
+
+            # Filter/sort indexes for /saved and export
+            await create_missing_indexes(conn)
+
+            # Full-text search column and indexes
+            await ensure_search_index(conn)
+
+            # Saved searches and the background scrape queue
+            await conn.run_sync(lambda sync_conn: Job.metadata.create_all(
+                sync_conn, tables=[SavedSearch.__table__, ScrapeTask.__table__]
+            ))
             
         print("Migration completed")
         return True
@@ -56,12 +101,15 @@ async def reset_database():
                     location VARCHAR NOT NULL,
                     description VARCHAR,
                     url VARCHAR NOT NULL,
+                    url_key VARCHAR,
                     source VARCHAR DEFAULT 'Unknown',
                     liked BOOLEAN DEFAULT FALSE,
                     applied BOOLEAN DEFAULT FALSE,
                     created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
                 )
             """))
+            await create_missing_indexes(conn)
+            await ensure_search_index(conn)
             
         print("Database reset completed")
         return True
@@ -7,11 +7,13 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
 from app.db import engine
 from app.models import Base
+from app.search import ensure_search_index
 
 async def setup_database():
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await ensure_search_index(conn)
         print("Database tables created successfully")
     except Exception as e:
         print(f"Database setup failed: {e}")
@@ -1,10 +1,47 @@
 import os
 import sys
 
+import pytest
+
 # ensure app is importable when running tests from project root
 TESTS_DIR = os.path.dirname(__file__)
 PROJECT_ROOT = os.path.dirname(TESTS_DIR)
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from tests.fakes import FakeRedis  # noqa: E402
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers():
+    """Circuit breakers are process-wide; start every test with them closed."""
+    from app.scraper.resilience import BREAKERS
+
+    BREAKERS.clear()
+    yield
+    BREAKERS.clear()
+
+
+@pytest.fixture
+async def sqlite_sessions(monkeypatch):
+    """In-memory SQLite database wired in place of the Postgres session factory."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.models import Base
+    from app.search import ensure_search_index
 
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await ensure_search_index(conn)
+    sessions = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr("app.crud.AsyncSessionLocal", sessions, raising=True)
+    yield sessions
+    await engine.dispose()
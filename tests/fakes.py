@@ -0,0 +1,46 @@
+"""Test doubles shared by the test suite and the benchmarks; no pytest imports here."""
+import asyncio
+
+
+class FakeRedis:
+    """In-memory stand-in for the parts of redis.asyncio the cache uses, counting round trips.
+
+    With ``rtt`` every round trip also sleeps that many seconds, which is how
+    benchmarks/bench_cache_batching.py simulates a remote Redis.
+    """
+
+    def __init__(self, rtt: float = 0.0) -> None:
+        self.rtt = rtt
+        self.data = {}
+        self.round_trips = 0
+
+    async def _trip(self) -> None:
+        self.round_trips += 1
+        if self.rtt:
+            await asyncio.sleep(self.rtt)
+
+    async def get(self, key):
+        await self._trip()
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        await self._trip()
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None):
+        await self._trip()
+        self.data[key] = value
+
+    def pipeline(self, transaction=True):
+        redis = self
+        commands = []
+
+        class _Pipeline:
+            def set(self, key, value, ex=None):
+                commands.append((key, value))
+
+            async def execute(self):
+                await redis._trip()
+                redis.data.update(commands)
+
+        return _Pipeline()
@@ -48,3 +48,107 @@ async def test_aggregate_jobs_per_source_limit(monkeypatch):
         assert counts.get(s, 0) == per_source_limit
 
 
+@pytest.mark.asyncio
+async def test_aggregate_jobs_returns_partial_results_on_deadline(monkeypatch):
+    async def quick(query: str, location: str, limit: int):
+        return [{"title": "Quick", "url": "https://example.com/q", "source": "Quick"}]
+
+    async def stuck(query: str, location: str, limit: int):
+        await asyncio.sleep(10)
+        return []
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"quick": quick, "stuck": stuck}, raising=True)
+
+    report = {}
+    jobs = await aggregate_jobs(sources=["quick", "stuck"], budget=0.1, report=report)
+
+    assert [j["title"] for j in jobs] == ["Quick"]
+    assert report["quick"]["status"] == "ok"
+    assert report["stuck"]["status"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_source_fragments_are_shared_across_source_combinations(monkeypatch):
+    from app.cache import LocalCache
+
+    calls = []
+
+    def make_scraper(name):
+        async def _scraper(query: str, location: str, limit: int):
+            calls.append(name)
+            return [{"title": f"{name} {query}", "url": f"https://example.com/{name}", "source": name}]
+        return _scraper
+
+    async def broken(query: str, location: str, limit: int):
+        calls.append("broken")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(
+        "app.scraper.SCRAPERS",
+        {"linkedin": make_scraper("linkedin"), "careerjet": make_scraper("careerjet"),
+         "timesjobs": make_scraper("timesjobs"), "broken": broken},
+        raising=True,
+    )
+    app = types.SimpleNamespace(state=types.SimpleNamespace(redis=None, local_cache=LocalCache()))
+
+    await aggregate_jobs(query="Python  Developer", location="Pune", sources=["linkedin", "careerjet", "broken"], app=app)
+    report = {}
+    jobs = await aggregate_jobs(
+        query="python developer", location="pune", sources=["careerjet", "timesjobs", "linkedin", "broken"],
+        report=report, app=app,
+    )
+
+    # Only the source not seen before (and the failed one) were scraped again
+    assert calls == ["linkedin", "careerjet", "broken", "timesjobs", "broken"]
+    assert [j["source"] for j in jobs] == ["careerjet", "timesjobs", "linkedin"]
+    assert report["careerjet"]["cached"] is True
+    assert "cached" not in report["timesjobs"]
+    assert report["broken"]["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_empty_source_results_are_not_cached(monkeypatch):
+    from app.cache import LocalCache
+
+    calls = []
+
+    async def throttled(query: str, location: str, limit: int):
+        calls.append(1)
+        return []
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"throttled": throttled}, raising=True)
+    app = types.SimpleNamespace(state=types.SimpleNamespace(redis=None, local_cache=LocalCache()))
+
+    await aggregate_jobs(sources=["throttled"], app=app)
+    await aggregate_jobs(sources=["throttled"], app=app)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_cached_sources(monkeypatch):
+    from app.cache import LocalCache, get_cache
+    from app.scraper import iter_jobs, source_cache_key
+
+    cancelled = []
+
+    async def quick(query: str, location: str, limit: int):
+        return [{"title": "Quick", "url": "https://example.com/q", "source": "Quick"}]
+
+    async def stuck(query: str, location: str, limit: int):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append("stuck")
+            raise
+        return [{"title": "Late", "url": "https://example.com/late", "source": "Stuck"}]
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"quick": quick, "stuck": stuck}, raising=True)
+    app = types.SimpleNamespace(state=types.SimpleNamespace(redis=None, local_cache=LocalCache()))
+
+    events = iter_jobs(sources=["quick", "stuck"], app=app)
+    assert (await anext(events))["source"] == "quick"
+    await events.aclose()
+
+    assert cancelled == ["stuck"]
+    assert app.state.cache_inflight == {}
+    assert await get_cache(app, source_cache_key("stuck", "python developer", "remote", 10)) is None
@@ -0,0 +1,88 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.crud import save_job, save_jobs_bulk
+from app.main import app
+from app.normalize import normalize_url
+
+
+def _job(i, **extra):
+    return {
+        "title": f"Job {i}",
+        "company": "Co",
+        "location": "Pune",
+        "description": "",
+        "url": f"https://www.linkedin.com/jobs/view/{i}/?refId=abc&trackingId=xyz",
+        "source": "LinkedIn",
+        **extra,
+    }
+
+
+def test_normalize_url_drops_tracking_and_host_variants():
+    assert normalize_url("https://in.linkedin.com/jobs/view/42/?refId=a&trackingId=b#top") == (
+        "https://linkedin.com/jobs/view/42"
+    )
+    assert normalize_url("http://www.timesjobs.com/job-detail/x?jobid=7&utm_source=mail") == (
+        "https://timesjobs.com/job-detail/x?jobid=7"
+    )
+
+
+@pytest.mark.asyncio
+async def test_save_jobs_bulk_upserts_on_normalized_url(sqlite_sessions):
+    first = await save_jobs_bulk([_job(1), _job(2)])
+    assert first["inserted"] == 2 and first["updated"] == 0
+
+    liked = await save_job({**_job(1), "liked": True})
+    assert liked["job_id"] == first["job_ids"][0]
+
+    # Same postings via another LinkedIn host, plus a new one and an in-batch repeat
+    again = await save_jobs_bulk([
+        {**_job(2), "url": "https://uk.linkedin.com/jobs/view/2?trk=feed", "title": "Job 2 (updated)"},
+        _job(3),
+        {**_job(1), "liked": False},
+        _job(3),
+    ])
+    assert again["job_ids"][0] == first["job_ids"][1]
+    assert again["job_ids"][2] == first["job_ids"][0]
+    assert again["job_ids"][1] == again["job_ids"][3]
+    assert again["inserted"] == 1 and again["updated"] == 2
+
+    from sqlalchemy.future import select
+    from app.models import Job
+
+    async with sqlite_sessions() as session:
+        jobs = {job.id: job for job in (await session.execute(select(Job))).scalars().all()}
+    assert len(jobs) == 3
+    assert jobs[first["job_ids"][1]].title == "Job 2 (updated)"
+    # A re-save never clears a like
+    assert jobs[first["job_ids"][0]].liked is True
+
+
+def test_save_bulk_endpoint_returns_ids_in_input_order(sqlite_sessions):
+    client = TestClient(app)
+    resp = client.post("/api/jobs/save/bulk", json=[_job(5), _job(4), _job(5)])
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["inserted"] == 2
+    assert data["job_ids"][0] == data["job_ids"][2] != data["job_ids"][1]
+
+
+@pytest.mark.asyncio
+async def test_save_jobs_bulk_keeps_every_job_without_url(sqlite_sessions):
+    result = await save_jobs_bulk([_job(1, url=""), _job(2), _job(3, url=""), _job(4, url="")])
+    assert result["inserted"] == 4 and result["updated"] == 0
+    assert len(set(result["job_ids"])) == 4
+
+    # Saving them again can't match them to anything, so they are new rows again
+    again = await save_jobs_bulk([_job(1, url=""), _job(2)])
+    assert again["inserted"] == 1 and again["updated"] == 1
+    assert again["job_ids"][1] == result["job_ids"][1]
+
+    from sqlalchemy.future import select
+    from app.models import Job
+
+    async with sqlite_sessions() as session:
+        jobs = {job.id: job for job in (await session.execute(select(Job))).scalars().all()}
+    assert len(jobs) == 5
+    assert [jobs[job_id].title for job_id in result["job_ids"]] == ["Job 1", "Job 2", "Job 3", "Job 4"]
+    assert jobs[result["job_ids"][0]].url_key is None
@@ -0,0 +1,205 @@
+import asyncio
+import types
+
+import pytest
+
+from app import cache as cache_mod
+
+
+def _app():
+    return types.SimpleNamespace(state=types.SimpleNamespace(redis=None, local_cache=cache_mod.LocalCache(max_entries=2)))
+
+
+def test_local_cache_evicts_least_recently_used_and_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+    local = cache_mod.LocalCache(max_entries=2)
+    local.set("a", 1, ttl_seconds=10)
+    local.set("b", 2, ttl_seconds=10)
+    assert local.get("a") == 1  # "b" is now the oldest
+    local.set("c", 3, ttl_seconds=10)
+    assert local.get("b") is None
+    assert local.get("a") == 1 and local.get("c") == 3
+
+    now[0] += 10
+    assert local.get("a") is None
+    assert len(local) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_build_coalesces_concurrent_misses():
+    app = _app()
+    calls = 0
+
+    async def build():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"jobs": [calls]}
+
+    results = await asyncio.gather(*(cache_mod.get_or_build(app, "scrape:q", build) for _ in range(20)))
+    assert calls == 1
+    assert all(result == {"jobs": [1]} for result in results)
+
+    assert await cache_mod.get_or_build(app, "scrape:q", build) == {"jobs": [1]}
+    stats = cache_mod.cache_stats(app)
+    assert stats["misses"] == 20
+    assert stats["coalesced"] == 19
+    assert stats["local_hits"] == 1
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_build_skips_uncacheable_results():
+    app = _app()
+
+    async def build():
+        return {"status": "timeout"}
+
+    await cache_mod.get_or_build(app, "k", build, cacheable=lambda value: value["status"] == "ok")
+    assert await cache_mod.get_cache(app, "k") is None
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_one_refresh_runs(monkeypatch):
+    app = _app()
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now[0])
+    release = asyncio.Event()
+    calls = 0
+
+    async def build():
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            await release.wait()
+        return calls
+
+    assert await cache_mod.get_or_build(app, "k", build, ttl_seconds=600, fresh_seconds=60) == 1
+    now[0] += 61
+
+    # Past the soft TTL: every caller gets the old value at once, one refresh runs
+    stale = await asyncio.gather(*(
+        cache_mod.get_or_build(app, "k", build, ttl_seconds=600, fresh_seconds=60) for _ in range(5)
+    ))
+    assert stale == [1] * 5
+    assert calls == 2
+
+    release.set()
+    await asyncio.gather(*list(app.state.cache_inflight.values()))
+    assert await cache_mod.get_or_build(app, "k", build, ttl_seconds=600, fresh_seconds=60) == 2
+    stats = cache_mod.cache_stats(app)
+    assert stats["stale_hits"] == 5
+    assert stats["refreshes"] == 1
+
+
+def test_codec_round_trips_and_reads_legacy_entries():
+    small = {"jobs": [{"title": "Dev"}]}
+    large = {"jobs": [{"title": f"Dev {i}", "description": "x" * 50} for i in range(100)]}
+
+    assert cache_mod.decode_entry(cache_mod.encode_entry(small)) == (small, None)
+    encoded = cache_mod.encode_entry(large, fresh_until=123.5)
+    assert len(encoded) < len(cache_mod.dumps_json(large)) / 4
+    assert cache_mod.decode_entry(encoded) == (large, 123.5)
+    assert cache_mod.decode_entry(cache_mod.encode_entry(b'{"raw":1}')) == (b'{"raw":1}', None)
+
+    # Plain JSON text and the earlier {"fresh_until", "value"} envelope
+    assert cache_mod.decode_entry(b'{"jobs": []}') == ({"jobs": []}, None)
+    assert cache_mod.decode_entry(b'{"fresh_until": 5.0, "value": [1]}') == ([1], 5.0)
+
+
+@pytest.mark.asyncio
+async def test_get_or_build_caches_encoded_bytes():
+    app = _app()
+
+    async def build():
+        return {"ok": True}
+
+    first = await cache_mod.get_or_build(app, "k", build, encode=cache_mod.dumps_json)
+    second = await cache_mod.get_or_build(app, "k", build, encode=cache_mod.dumps_json)
+    assert first == second == b'{"ok":true}'
+    assert cache_mod.cache_stats(app)["local_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_many_and_set_many_use_one_round_trip_each(fake_redis):
+    redis = fake_redis
+    app = types.SimpleNamespace(state=types.SimpleNamespace(redis=redis, local_cache=cache_mod.LocalCache()))
+
+    await cache_mod.set_many(app, {f"k{i}": {"i": i} for i in range(50)}, ttl_seconds=60)
+    assert redis.round_trips == 1
+
+    # A second process: empty local tier, same Redis
+    other = types.SimpleNamespace(state=types.SimpleNamespace(redis=redis, local_cache=cache_mod.LocalCache()))
+    found = await cache_mod.get_many(other, [f"k{i}" for i in range(60)])
+    assert redis.round_trips == 2
+    assert found == {f"k{i}": {"i": i} for i in range(50)}
+    assert cache_mod.cache_stats(other)["misses"] == 10
+
+    # Now served from the local tier without touching Redis
+    assert await cache_mod.get_many(other, ["k1", "k2"]) == {"k1": {"i": 1}, "k2": {"i": 2}}
+    assert redis.round_trips == 2
+
+
+@pytest.mark.asyncio
+async def test_get_many_without_redis_uses_local_tier():
+    app = _app()
+    await cache_mod.set_many(app, {"a": 1, "b": 2})
+    assert await cache_mod.get_many(app, ["a", "b", "c"]) == {"a": 1, "b": 2}
+
+
+@pytest.mark.asyncio
+async def test_own_writes_stay_local_no_longer_than_redis_reads(monkeypatch, fake_redis):
+    now = [100.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+    app = types.SimpleNamespace(state=types.SimpleNamespace(redis=fake_redis, local_cache=cache_mod.LocalCache()))
+    other = types.SimpleNamespace(state=types.SimpleNamespace(redis=fake_redis, local_cache=cache_mod.LocalCache()))
+
+    await cache_mod.set_cache(app, "k", "old", ttl_seconds=3600)
+    await cache_mod.set_many(app, {"m": "old"}, ttl_seconds=3600)
+    # Another process refreshes both in Redis
+    await cache_mod.set_cache(other, "k", "new", ttl_seconds=3600)
+    await cache_mod.set_many(other, {"m": "new"}, ttl_seconds=3600)
+    assert await cache_mod.get_cache(app, "k") == "old"
+
+    now[0] += cache_mod.LOCAL_CACHE_TTL_SECONDS
+    assert await cache_mod.get_cache(app, "k") == "new"
+    assert await cache_mod.get_many(app, ["m"]) == {"m": "new"}
+
+    # Without Redis the local tier is the cache and keeps the full TTL
+    alone = _app()
+    await cache_mod.set_cache(alone, "k", "v", ttl_seconds=3600)
+    now[0] += cache_mod.LOCAL_CACHE_TTL_SECONDS
+    assert await cache_mod.get_cache(alone, "k") == "v"
+
+
+@pytest.mark.asyncio
+async def test_build_is_cancelled_only_with_its_last_waiter():
+    app = _app()
+    release = asyncio.Event()
+    cancelled = []
+
+    async def build():
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "value"
+
+    first = asyncio.ensure_future(cache_mod.get_or_build(app, "k", build))
+    second = asyncio.ensure_future(cache_mod.get_or_build(app, "k", build))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    release.set()
+    assert await second == "value" and cancelled == []
+
+    release.clear()
+    alone = asyncio.ensure_future(cache_mod.get_or_build(app, "other", build))
+    await asyncio.sleep(0)
+    alone.cancel()
+    await asyncio.gather(alone, return_exceptions=True)
+    assert cancelled == [True]
+    assert app.state.cache_inflight == {} and app.state.cache_waiters == {}
+    assert await cache_mod.get_cache(app, "other") is None
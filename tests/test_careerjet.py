@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.scraper import careerjet
+from app.scraper import http as http_mod
+from app.scraper.concurrency import race_first
+
+
+CARD_PAGE = """
+<html><body>
+  <article class="job"><h2><a href="/jobad/1">Python Developer</a></h2>
+    <p class="company">ACME</p><ul class="locations"><li>Pune</li></ul></article>
+  <article class="job"><h2><a href="/jobad/2">Backend Engineer</a></h2>
+    <p class="company">Globex</p><ul class="locations"><li>Remote</li></ul></article>
+</body></html>
+"""
+
+
+@pytest.mark.asyncio
+async def test_race_first_cancels_losers():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+        return ["late"]
+
+    async def empty():
+        return []
+
+    async def winner():
+        await asyncio.sleep(0.01)
+        return ["won"]
+
+    result = await race_first([slow, empty, winner], width=3)
+    assert result == ["won"]
+    assert cancelled == ["slow"]
+
+
+@pytest.mark.asyncio
+async def test_scrape_careerjet_uses_first_page_with_cards(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "www.careerjet.co.in":
+            return httpx.Response(200, text=CARD_PAGE)
+        return httpx.Response(503)
+
+    pool = http_mod.HostPool()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_mod, "_pool", pool)
+    try:
+        jobs = await careerjet.scrape_careerjet("python developer", "pune", limit=1)
+    finally:
+        await pool.aclose()
+
+    assert len(jobs) == 1
+    assert jobs[0]["title"] == "Python Developer"
+    assert jobs[0]["url"] == "https://www.careerjet.com/jobad/1"
+    assert jobs[0]["source"] == "CareerJet"
@@ -3,7 +3,10 @@ import types
 
 import pytest
 
+from datetime import datetime, timedelta
+
 from app.crud import get_saved_jobs
+from app.models import Job
 
 
 @pytest.mark.asyncio
@@ -16,6 +19,8 @@ async def test_get_saved_jobs_filters_build(monkeypatch):
                         def all(self):
                             return [types.SimpleNamespace(__dict__={"id": 1}), types.SimpleNamespace(__dict__={"id": 2})]
                     return Scalars()
+                def scalar_one(self):
+                    return 2
             return Result()
         async def __aenter__(self):
             return self
@@ -43,3 +48,113 @@ async def test_get_saved_jobs_filters_build(monkeypatch):
     assert "pagination" in result and result["pagination"]["limit"] == 10
 
 
+@pytest.mark.asyncio
+async def test_get_saved_jobs_total_counts_all_matching_rows(sqlite_sessions):
+    async with sqlite_sessions() as session:
+        session.add_all(
+            Job(title=f"Job {i}", company="Co", location="Pune", url=f"https://example.com/{i}", liked=i % 2 == 0)
+            for i in range(5)
+        )
+        await session.commit()
+
+    result = await get_saved_jobs(liked=True, limit=2)
+    assert len(result["jobs"]) == 2
+    assert result["pagination"]["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_get_saved_jobs_keyset_pages_match_offset_pages(sqlite_sessions):
+    base = datetime(2025, 1, 1)
+    async with sqlite_sessions() as session:
+        # Pairs share a timestamp so the id tie-breaker matters
+        session.add_all(
+            Job(title=f"Job {i}", company="Co", location="Pune", url=f"https://example.com/{i}",
+                created_at=base + timedelta(minutes=i // 2))
+            for i in range(7)
+        )
+        await session.commit()
+
+    first = await get_saved_jobs(limit=3)
+    assert first["pagination"]["total"] == 7
+    seen = [j["title"] for j in first["jobs"]]
+
+    cursor = first["pagination"]["next_cursor"]
+    while cursor:
+        page = await get_saved_jobs(limit=3, cursor=cursor)
+        assert page["pagination"]["total"] is None
+        seen += [j["title"] for j in page["jobs"]]
+        cursor = page["pagination"]["next_cursor"]
+
+    offset_titles = []
+    for offset in range(0, 7, 3):
+        offset_titles += [j["title"] for j in (await get_saved_jobs(limit=3, offset=offset))["jobs"]]
+
+    assert seen == offset_titles
+    assert sorted(seen) == sorted(f"Job {i}" for i in range(7))
+
+
+@pytest.mark.asyncio
+async def test_get_saved_jobs_rejects_bad_cursor():
+    with pytest.raises(ValueError):
+        await get_saved_jobs(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_get_saved_jobs_full_text_search_ranks_matches(sqlite_sessions):
+    async with sqlite_sessions() as session:
+        session.add_all([
+            Job(title="Office Manager", company="Python Foods", location="Pune", url="https://example.com/1",
+                description=""),
+            Job(title="Senior Python Developer", company="ACME", location="Pune", url="https://example.com/2",
+                description="Django and FastAPI"),
+            Job(title="Java Developer", company="Globex", location="Pune", url="https://example.com/3",
+                description="Spring"),
+        ])
+        await session.commit()
+
+    result = await get_saved_jobs(search="pyth")
+    assert [j["title"] for j in result["jobs"]] == ["Senior Python Developer", "Office Manager"]
+    assert result["pagination"]["total"] == 2
+
+    # Index follows updates through the triggers
+    async with sqlite_sessions() as session:
+        job = await session.get(Job, 3)
+        job.description = "Spring and some Python scripting"
+        await session.commit()
+
+    result = await get_saved_jobs(search="python developer")
+    assert sorted(j["title"] for j in result["jobs"]) == ["Java Developer", "Senior Python Developer"]
+
+
+@pytest.mark.asyncio
+async def test_get_saved_jobs_search_cursors_walk_relevance_order(sqlite_sessions):
+    base = datetime(2025, 1, 1)
+    async with sqlite_sessions() as session:
+        # Three relevance tiers, with rank and timestamp ties inside each
+        session.add_all(
+            Job(title=["Python Developer", "Backend Engineer", "Office Manager"][i % 3],
+                company="Co", location="Pune", url=f"https://example.com/{i}",
+                description="python" if i % 3 else "", created_at=base + timedelta(minutes=i // 4))
+            for i in range(11)
+        )
+        await session.commit()
+
+    first = await get_saved_jobs(search="python", limit=3)
+    ids = [j["id"] for j in first["jobs"]]
+    cursor = first["pagination"]["next_cursor"]
+    while cursor:
+        page = await get_saved_jobs(search="python", limit=3, cursor=cursor)
+        ids += [j["id"] for j in page["jobs"]]
+        cursor = page["pagination"]["next_cursor"]
+
+    offset_ids = []
+    for offset in range(0, first["pagination"]["total"], 3):
+        offset_ids += [j["id"] for j in (await get_saved_jobs(search="python", limit=3, offset=offset))["jobs"]]
+
+    assert len(ids) == len(set(ids)) == first["pagination"]["total"] == 11
+    assert ids == offset_ids
+    # Title matches outrank description-only matches
+    assert {j["title"] for j in first["jobs"]} == {"Python Developer"}
+
+    with pytest.raises(ValueError):
+        await get_saved_jobs(limit=3, cursor=first["pagination"]["next_cursor"])
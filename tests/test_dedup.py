@@ -0,0 +1,74 @@
+from app.scraper.dedup import dedupe_jobs, normalize_company, normalize_location, normalize_title, simhash
+
+
+def _job(source, title, company, location="Pune", url=None):
+    return {
+        "title": title,
+        "company": company,
+        "location": location,
+        "description": "",
+        "url": url or f"https://example.com/{source}/{abs(hash((title, company)))}",
+        "source": source,
+    }
+
+
+def test_normalizers():
+    assert normalize_company("Acme Technologies Pvt. Ltd.") == "acme technologies"
+    assert normalize_company("ACME TECHNOLOGIES PRIVATE LIMITED") == "acme technologies"
+    assert normalize_title("Sr. Python Dev") == "senior python developer"
+    assert normalize_location("Pune, Maharashtra, India") == "pune"
+    assert normalize_company("Unknown Company") == normalize_location("Remote") == ""
+    assert simhash("senior python developer") == simhash("python developer senior")
+
+
+def test_same_posting_across_boards_is_merged():
+    jobs = [
+        _job("LinkedIn", "Senior Python Developer", "Acme Technologies Pvt Ltd", "Pune, Maharashtra, India",
+             url="https://in.linkedin.com/jobs/view/123?refId=abc&trackingId=xyz"),
+        _job("CareerJet", "Sr. Python Developer", "ACME Technologies Private Limited", "Pune"),
+        _job("TimesJobs", "Senior Python Developer", "Acme Technologies", ""),
+        _job("TimesJobs", "Python Developer", "Acme Technologies"),
+        # Same URL after canonicalization, whatever the other fields say
+        _job("CareerJet", "Python Dev (Remote)", "", url="https://www.linkedin.com/jobs/view/123/"),
+    ]
+    merged = dedupe_jobs(jobs)
+
+    assert [job["title"] for job in merged] == ["Senior Python Developer", "Python Developer"]
+    assert merged[0]["sources"] == ["LinkedIn", "CareerJet", "TimesJobs"]
+    assert merged[0]["url"].startswith("https://in.linkedin.com/")
+    assert merged[1]["sources"] == ["TimesJobs"]
+
+
+def test_distinct_companies_and_places_stay_apart():
+    jobs = [
+        _job("LinkedIn", "Python Developer", "Acme"),
+        _job("CareerJet", "Python Developer", "Globex"),
+        _job("TimesJobs", "Python Developer", "Acme", "Bangalore"),
+        _job("TimesJobs", "Python Developer", ""),
+        _job("LinkedIn", "Python Developer", ""),
+    ]
+    assert len(dedupe_jobs(jobs)) == 5
+
+
+def test_placeholder_company_only_merges_on_url():
+    jobs = [
+        _job("LinkedIn", "Python Developer", "Unknown Company", "Remote", url="https://linkedin.com/jobs/view/1"),
+        _job("CareerJet", "Python Developer", "Unknown Company", "Remote"),
+        _job("TimesJobs", "Python Developer II", "Unknown Company", "Remote"),
+        _job("CareerJet", "Python Developer", "Unknown Company", "Remote", url="https://www.linkedin.com/jobs/view/1/"),
+    ]
+    merged = dedupe_jobs(jobs)
+    assert [job["sources"] for job in merged] == [["LinkedIn", "CareerJet"], ["CareerJet"], ["TimesJobs"]]
+
+
+def test_same_source_postings_only_merge_on_url():
+    jobs = [
+        _job("LinkedIn", "Python Developer", "Infosys", url="https://www.linkedin.com/jobs/view/111"),
+        _job("LinkedIn", "Python Developer", "Infosys", url="https://www.linkedin.com/jobs/view/222"),
+        _job("CareerJet", "Python Developer", "Infosys Ltd"),
+    ]
+    merged = dedupe_jobs(jobs)
+    assert [job["url"] for job in merged] == [
+        "https://www.linkedin.com/jobs/view/111", "https://www.linkedin.com/jobs/view/222",
+    ]
+    assert merged[0]["sources"] == ["LinkedIn", "CareerJet"]
@@ -0,0 +1,104 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.crud import stream_applied_jobs
+from app.main import app
+from app.models import Job
+
+
+async def _seed(sessions, count):
+    base = datetime(2025, 1, 1)
+    async with sessions() as session:
+        session.add_all(
+            Job(title=f"Job {i}", company="Co", location="Pune", url=f"https://example.com/{i}",
+                applied=i % 2 == 0, created_at=base + timedelta(minutes=i))
+            for i in range(count)
+        )
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_stream_applied_jobs_csv_in_chunks(sqlite_sessions):
+    await _seed(sqlite_sessions, 10)
+
+    chunks = [chunk async for chunk in stream_applied_jobs(format="csv", chunk_rows=2)]
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert [r["Title"] for r in rows] == ["Job 8", "Job 6", "Job 4", "Job 2", "Job 0"]
+    assert rows[0]["Applied"] == "Yes"
+
+
+@pytest.mark.asyncio
+async def test_stream_applied_jobs_empty(sqlite_sessions):
+    assert [chunk async for chunk in stream_applied_jobs()] == []
+
+
+@pytest.mark.asyncio
+async def test_export_endpoints_stream_csv_ndjson_and_gzip(sqlite_sessions):
+    client = TestClient(app)
+    assert client.get("/api/jobs/export").json() == {"message": "No applied jobs found"}
+
+    await _seed(sqlite_sessions, 4)
+
+    resp = client.get("/api/jobs/export")
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert "applied_jobs_" in resp.headers["content-disposition"]
+    assert [r["Title"] for r in csv.DictReader(io.StringIO(resp.text))] == ["Job 2", "Job 0"]
+
+    resp = client.get("/api/jobs/export/json")
+    assert [json.loads(line)["Title"] for line in resp.text.splitlines()] == ["Job 2", "Job 0"]
+
+    with client.stream("GET", "/api/jobs/export", params={"gzip": True}) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        raw = b"".join(resp.iter_raw())
+    assert [r["Title"] for r in csv.DictReader(io.StringIO(gzip.decompress(raw).decode()))] == ["Job 2", "Job 0"]
+
+
+@pytest.mark.asyncio
+async def test_export_columnar_parquet_and_arrow(sqlite_sessions):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    from app.columnar import stream_jobs_columnar
+
+    await _seed(sqlite_sessions, 5)
+
+    data = b"".join([chunk async for chunk in stream_jobs_columnar("parquet", applied=True, chunk_rows=2)])
+    table = pq.read_table(io.BytesIO(data))
+    assert table.column("title").to_pylist() == ["Job 4", "Job 2", "Job 0"]
+    assert table.schema.field("created_at").type == pa.timestamp("us")
+
+    client = TestClient(app)
+    resp = client.get("/api/jobs/export/columnar", params={
+        "format": "arrow", "created_after": "2025-01-01T00:01:00", "created_before": "2025-01-01T00:03:00",
+    })
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(resp.content).read_all()
+    assert table.column("title").to_pylist() == ["Job 2", "Job 1"]
+
+
+def test_export_columnar_501_only_without_pyarrow(monkeypatch):
+    import app.columnar as columnar
+
+    client = TestClient(app)
+    monkeypatch.setattr(columnar, "pa", None)
+    assert client.get("/api/jobs/export/columnar").status_code == 501
+
+    pytest.importorskip("pyarrow")
+    monkeypatch.undo()
+
+    async def broken(filters, chunk_rows):
+        raise RuntimeError("cursor went away")
+        yield
+
+    monkeypatch.setattr(columnar, "iter_job_chunks", broken)
+    resp = client.get("/api/jobs/export/columnar")
+    assert resp.status_code == 500
+    assert "cursor went away" in resp.json()["detail"]
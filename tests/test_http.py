@@ -0,0 +1,104 @@
+import asyncio
+import types
+
+import httpx
+import pytest
+
+from app.scraper import http as http_mod
+
+
+@pytest.mark.asyncio
+async def test_http_pool_is_shared_after_init():
+    app = types.SimpleNamespace(state=types.SimpleNamespace())
+    await http_mod.init_http(app)
+    try:
+        async with http_mod.http_pool() as first:
+            pass
+        async with http_mod.http_pool() as second:
+            pass
+        assert first is second is app.state.http
+        assert first.client.is_closed is False
+    finally:
+        await http_mod.close_http(app)
+    assert first.client.is_closed is True
+
+
+@pytest.mark.asyncio
+async def test_host_pool_limits_per_host():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.host)
+        return httpx.Response(200, text="ok")
+
+    pool = http_mod.HostPool(max_per_host=2)
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        resp = await pool.get("https://www.linkedin.com/jobs/search")
+        assert resp.status_code == 200
+        slot = pool._slot("www.linkedin.com")
+        assert slot.in_flight == 0 and slot.limit == 2
+    finally:
+        await pool.aclose()
+    assert seen == ["www.linkedin.com"]
+
+
+@pytest.mark.asyncio
+async def test_host_pool_backs_off_on_429_and_honours_retry_after(monkeypatch):
+    monkeypatch.setattr("app.scraper.ratelimit.HOST_RATE", 0)
+    statuses = [429, 200, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        return httpx.Response(status, headers={"Retry-After": "1"} if status == 429 else {})
+
+    pool = http_mod.HostPool(max_per_host=4)
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        assert (await pool.get("https://example.com/a")).status_code == 429
+        slot = pool._slot("example.com")
+        assert slot.limit == 2
+        assert pool.host_stats()["example.com"]["blocked_for"] > 0.5
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        assert (await pool.get("https://example.com/b")).status_code == 200
+        assert loop.time() - started >= 0.9
+        assert slot.limit == 2.5
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_requests_after_the_burst(monkeypatch):
+    from app.scraper.ratelimit import TokenBucket
+
+    monkeypatch.setattr("app.scraper.ratelimit.HOST_RATE", 20)
+    bucket = TokenBucket(burst=2)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(4):
+        await bucket.acquire("example.com")
+    # Two from the burst, then one every 50 ms
+    assert 0.09 <= loop.time() - started < 0.3
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_cancelled_waiters_give_their_tokens_back(monkeypatch):
+    from app.scraper.ratelimit import TokenBucket
+
+    monkeypatch.setattr("app.scraper.ratelimit.HOST_RATE", 10)
+    bucket = TokenBucket(burst=5)
+    waiters = [asyncio.ensure_future(bucket.acquire("example.com")) for _ in range(200)]
+    await asyncio.sleep(0.2)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    # Debt never passes the burst, and every abandoned reservation was refunded
+    assert bucket._local["example.com"][0] >= -5
+
+    await asyncio.sleep(0.3)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await asyncio.wait_for(bucket.acquire("example.com"), timeout=1)
+    assert loop.time() - started < 0.2
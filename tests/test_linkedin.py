@@ -0,0 +1,36 @@
+import httpx
+import pytest
+
+from app.scraper import http as http_mod
+from app.scraper import linkedin
+
+
+def _cards(ids) -> str:
+    return "".join(
+        f'<li><div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:{i}">'
+        f'<a class="base-card__full-link" href="https://in.linkedin.com/jobs/view/{i}?refId=x"></a>'
+        f'<h3 class="base-search-card__title">Job {i}</h3>'
+        f'<h4 class="base-search-card__subtitle">Co {i}</h4></div></li>'
+        for i in ids
+    )
+
+
+@pytest.mark.asyncio
+async def test_scrape_linkedin_pages_and_dedupes(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/jobs/search":
+            return httpx.Response(200, text=_cards(range(0, 3)))
+        start = int(request.url.params["start"])
+        # Pages overlap by one card, as LinkedIn's do when new postings arrive
+        return httpx.Response(200, text=_cards(range(start - 1, start + 3)))
+
+    pool = http_mod.HostPool()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_mod, "_pool", pool)
+    try:
+        jobs = await linkedin.scrape_linkedin("python", "remote", limit=7)
+    finally:
+        await pool.aclose()
+
+    assert [j["title"] for j in jobs] == [f"Job {i}" for i in range(7)]
+    assert jobs[0]["company"] == "Co 0"
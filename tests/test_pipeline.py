@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from app.scraper import aggregate_jobs
+
+
+def _jobs(source, ids):
+    return [
+        {"title": f"{source} {i}", "company": "Co", "location": "Pune", "description": "",
+         "url": f"https://example.com/{source}/{i}", "liked": False, "applied": False, "source": source}
+        for i in ids
+    ]
+
+
+@pytest.mark.asyncio
+async def test_aggregate_jobs_persist_writes_while_scraping(monkeypatch, sqlite_sessions):
+    writes = []
+
+    import app.pipeline as pipeline_mod
+    real_save = pipeline_mod.save_jobs_bulk
+
+    async def recording_save(jobs):
+        writes.append(len(jobs))
+        return await real_save(jobs)
+
+    monkeypatch.setattr(pipeline_mod, "save_jobs_bulk", recording_save)
+
+    async def fast(query, location, limit):
+        return _jobs("fast", range(3)) + [{"title": "", "url": "https://example.com/no-title"}]
+
+    async def slow(query, location, limit):
+        # By the time this source finishes, the fast source is already stored
+        await asyncio.sleep(0.05)
+        assert writes == [3]
+        return _jobs("slow", range(2)) + _jobs("fast", [0])
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"fast": fast, "slow": slow}, raising=True)
+
+    report = {}
+    jobs = await aggregate_jobs(sources=["fast", "slow"], persist=True, report=report)
+
+    # The repeated fast/0 posting is merged in the response (but still counted as known on write)
+    assert len(jobs) == 6
+    assert report["persisted"] == {"inserted": 5, "known": 1, "skipped": 1}
+    assert writes == [3, 3]
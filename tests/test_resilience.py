@@ -0,0 +1,130 @@
+import httpx
+import pytest
+
+from app.scraper import _run_source
+from app.scraper import http as http_mod
+from app.scraper import resilience, timesjobs
+from app.scraper.resilience import CircuitBreaker, CircuitOpenError, ScrapeError, with_retries
+
+
+def _status_error(code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.com")
+    return httpx.HTTPStatusError("err", request=request, response=httpx.Response(code, request=request))
+
+
+@pytest.mark.asyncio
+async def test_with_retries_retries_only_transient_errors():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _status_error(503)
+        return "ok"
+
+    assert await with_retries(flaky, retries=2, base_delay=0.001) == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+
+    async def missing():
+        calls.append(1)
+        raise _status_error(404)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await with_retries(missing, retries=2, base_delay=0.001)
+    assert len(calls) == 1
+
+
+def test_breaker_opens_fails_fast_and_probes_half_open(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failures=2, reset_seconds=30)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] += 31
+    breaker.before_call()  # the probe
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.snapshot() == {"state": "open", "failures": 3, "retry_in": 30.0}
+
+    now[0] += 31
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.snapshot()["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_run_source_fails_fast_while_breaker_is_open(monkeypatch):
+    monkeypatch.setattr(resilience, "BREAKER_FAILURES", 2)
+    calls = []
+
+    async def down(query, location, limit):
+        calls.append(1)
+        raise ScrapeError("site down")
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"down": down}, raising=True)
+    for _ in range(3):
+        _, jobs, status = await _run_source("down", "python", "pune", 5, timeout=1)
+        assert jobs == [] and status["status"] == "error"
+    assert len(calls) == 2
+    assert status["error"].startswith("circuit open")
+    assert resilience.breaker_states()["down"]["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_timesjobs_surfaces_failure_instead_of_empty_result(monkeypatch):
+    monkeypatch.setattr(resilience, "RETRY_BASE_DELAY", 0.001)
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(502)
+
+    pool = http_mod.HostPool()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_mod, "_pool", pool)
+    try:
+        with pytest.raises(ScrapeError):
+            await timesjobs.scrape_timesjobs("python", "pune", limit=5)
+    finally:
+        await pool.aclose()
+    # Three page-1 variants, each tried once plus RETRY_ATTEMPTS retries
+    assert len(requests) == 3 * (1 + resilience.RETRY_ATTEMPTS)
+
+
+@pytest.mark.asyncio
+async def test_fetch_leaves_room_to_retry_a_timeout_within_the_source_deadline(monkeypatch):
+    monkeypatch.setattr(resilience, "RETRY_BASE_DELAY", 0.001)
+    read_timeouts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        read_timeouts.append(request.extensions["timeout"]["read"])
+        if len(read_timeouts) == 1:
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(200, text="ok")
+
+    pool = http_mod.HostPool()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def scraper(query, location, limit):
+        response = await resilience.fetch(pool, "https://example.com/jobs")
+        return [{"title": response.text}]
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"slow": scraper}, raising=True)
+    try:
+        _, jobs, status = await _run_source("slow", "python", "pune", 5, timeout=3)
+    finally:
+        await pool.aclose()
+    assert status["status"] == "ok" and jobs == [{"title": "ok"}]
+    # First attempt got a third of the 3 s deadline, not the full HTTP timeout
+    assert read_timeouts[0] <= 1.0
+    assert len(read_timeouts) == 2
@@ -14,7 +14,7 @@ def client():
 
 def test_scrape_endpoint_per_source_limit(monkeypatch, client):
     # dummey aggregator to control output size
-    async def fake_aggregate_jobs(query: str, location: str, limit: int, sources):
+    async def fake_aggregate_jobs(query: str, location: str, limit: int, sources, **kwargs):
         results = []
         for s in sources:
             for i in range(limit):
@@ -46,3 +46,29 @@ def test_scrape_endpoint_per_source_limit(monkeypatch, client):
     assert len(data["jobs"]) == 15
 
 
+def test_scrape_stream_ndjson_ends_with_summary(monkeypatch, client):
+    async def fast(query: str, location: str, limit: int):
+        return [{"title": "Fast", "company": "Co", "location": location, "description": "",
+                 "url": "https://example.com/fast", "liked": False, "applied": False, "source": "Fast"}]
+
+    async def broken(query: str, location: str, limit: int):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"fast": fast, "broken": broken}, raising=True)
+
+    resp = client.get("/api/jobs/scrape/stream", params={"sources": "fast,broken", "limit": 1})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines() if line]
+    assert [r["type"] for r in records] == ["jobs", "jobs", "summary"]
+    summary = records[-1]
+    assert summary["total_jobs"] == 1
+    assert summary["sources"]["fast"]["status"] == "ok"
+    assert summary["sources"]["broken"]["status"] == "error"
+    assert summary["sources"]["broken"]["error"] == "boom"
+
+
+def test_scrape_rejects_non_positive_budget(client):
+    for budget in (0, -1):
+        assert client.get("/api/jobs/scrape", params={"budget": budget}).status_code == 422
+        assert client.get("/api/jobs/scrape/stream", params={"budget": budget}).status_code == 422
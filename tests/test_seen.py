@@ -0,0 +1,101 @@
+import types
+
+import pytest
+
+from app import seen as seen_mod
+from app.crud import save_jobs_bulk
+from app.scraper import aggregate_jobs
+
+
+def test_bloom_filter_membership_and_file_reuse(tmp_path):
+    path = str(tmp_path / "seen.bits")
+    bloom = seen_mod.BloomFilter(capacity=1000, error_rate=0.01, path=path)
+    assert bloom.loaded is False
+    for i in range(1000):
+        bloom.add(f"https://example.com/{i}")
+    assert all(f"https://example.com/{i}" in bloom for i in range(1000))
+    false_positives = sum(f"https://example.org/{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+    bloom.publish()
+    bloom.close()
+
+    reopened = seen_mod.BloomFilter(capacity=1000, error_rate=0.01, path=path)
+    assert reopened.loaded is True
+    assert "https://example.com/42" in reopened
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_new_only_skips_stored_jobs(monkeypatch, sqlite_sessions):
+    await save_jobs_bulk([{"title": "Old", "url": "https://www.linkedin.com/jobs/view/1?refId=a", "source": "LinkedIn"}])
+
+    app = types.SimpleNamespace(state=types.SimpleNamespace())
+    await seen_mod.init_seen(app, engine=sqlite_sessions.kw["bind"])
+    try:
+        assert seen_mod.is_seen("https://in.linkedin.com/jobs/view/1")
+        await save_jobs_bulk([{"title": "Saved later", "url": "https://example.com/2", "source": "CareerJet"}])
+        assert seen_mod.is_seen("https://example.com/2")
+
+        async def scraper(query, location, limit):
+            return [
+                {"title": "Old", "url": "https://www.linkedin.com/jobs/view/1", "source": "LinkedIn"},
+                {"title": "Saved later", "url": "https://example.com/2", "source": "CareerJet"},
+                {"title": "New", "url": "https://example.com/3", "source": "CareerJet"},
+            ]
+
+        monkeypatch.setattr("app.scraper.SCRAPERS", {"fake": scraper}, raising=True)
+        report = {}
+        jobs = await aggregate_jobs(sources=["fake"], new_only=True, report=report)
+        assert [job["title"] for job in jobs] == ["New"]
+        assert report["skipped_known"] == 2
+    finally:
+        await seen_mod.close_seen(app)
+    assert seen_mod.is_seen("https://example.com/2") is False
+
+
+def test_bloom_filter_file_is_only_reused_once_published(tmp_path):
+    path = str(tmp_path / "seen.bits")
+    # A build that never finished leaves nothing at path to be mistaken for a filter
+    crashed = seen_mod.BloomFilter(capacity=1000, error_rate=0.01, path=path)
+    crashed.add("https://example.com/1")
+    crashed.close()
+    assert list(tmp_path.iterdir()) == []
+
+    # Two processes building at once end up sharing one file holding both their keys
+    first = seen_mod.BloomFilter(capacity=1000, error_rate=0.01, path=path)
+    second = seen_mod.BloomFilter(capacity=1000, error_rate=0.01, path=path)
+    first.add("https://example.com/1")
+    second.add("https://example.com/2")
+    first.publish()
+    second.publish()
+    second.add("https://example.com/3")
+    assert all(f"https://example.com/{i}" in first for i in (1, 2, 3))
+    first.close()
+    second.close()
+    assert [p.name for p in tmp_path.iterdir()] == ["seen.bits"]
+
+    reopened = seen_mod.BloomFilter(capacity=1000, error_rate=0.01, path=path)
+    assert reopened.loaded is True
+    assert all(f"https://example.com/{i}" in reopened for i in (1, 2, 3))
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_init_seen_starts_empty_before_migration(tmp_path):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE jobs (id INTEGER PRIMARY KEY, url VARCHAR)"))
+
+    app = types.SimpleNamespace(state=types.SimpleNamespace())
+    await seen_mod.init_seen(app, path=str(tmp_path / "seen.bits"), engine=engine)
+    try:
+        assert app.state.seen.loaded is False
+        assert seen_mod.is_seen("https://example.com/1") is False
+    finally:
+        await seen_mod.close_seen(app)
+        await engine.dispose()
+    # Not published, so the next start rebuilds from the migrated table
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,141 @@
+import asyncio
+import types
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import crud
+from app.worker import work
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_claimed_once_and_retried_until_max_attempts(monkeypatch, sqlite_sessions):
+    monkeypatch.setattr(crud, "TASK_MAX_ATTEMPTS", 2)
+    first = await crud.enqueue_scrape("python", "pune", ["linkedin"], 5)
+    second = await crud.enqueue_scrape("java", "pune", ["careerjet"], 5)
+
+    claimed = await crud.claim_tasks(1)
+    assert [task["task_id"] for task in claimed] == [first["task_id"]]
+    assert claimed[0]["status"] == "running" and claimed[0]["attempts"] == 1
+    assert [task["task_id"] for task in await crud.claim_tasks(5)] == [second["task_id"]]
+    assert await crud.claim_tasks(5) == []
+
+    assert await crud.finish_task(first["task_id"], 1, error="boom")
+    assert (await crud.get_task(first["task_id"]))["status"] == "queued"
+    await crud.claim_tasks(1)
+    assert await crud.finish_task(first["task_id"], 2, error="boom again")
+    task = await crud.get_task(first["task_id"])
+    assert task["status"] == "failed" and task["error"] == "boom again"
+
+    # A worker that died mid-task loses its lease
+    later = datetime.utcnow() + timedelta(seconds=crud.TASK_LEASE_SECONDS + 1)
+    assert [task["task_id"] for task in await crud.claim_tasks(5, now=later)] == [second["task_id"]]
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_are_bounded_and_stale_workers_cannot_finish(monkeypatch, sqlite_sessions):
+    monkeypatch.setattr(crud, "TASK_MAX_ATTEMPTS", 2)
+    task = await crud.enqueue_scrape("python", "pune", ["linkedin"], 5)
+    lease = timedelta(seconds=crud.TASK_LEASE_SECONDS + 1)
+    now = datetime.utcnow()
+
+    [slow] = await crud.claim_tasks(1, now=now)
+    # The first worker stalls past its lease and the task is handed out again
+    [retry] = await crud.claim_tasks(1, now=now + lease)
+    assert retry["attempts"] == 2
+
+    # The stale worker finishing late must not overwrite the live claim
+    assert not await crud.finish_task(task["task_id"], slow["attempts"], result={"total_jobs": 0})
+    assert (await crud.get_task(task["task_id"]))["status"] == "running"
+
+    # The second worker dies too: out of attempts, so the task fails instead of looping
+    assert await crud.claim_tasks(1, now=now + 2 * lease) == []
+    failed = await crud.get_task(task["task_id"])
+    assert failed["status"] == "failed" and failed["attempts"] == 2
+    assert not await crud.finish_task(task["task_id"], retry["attempts"], result={"total_jobs": 0})
+
+
+@pytest.mark.asyncio
+async def test_due_saved_searches_are_queued_once_per_interval(sqlite_sessions):
+    search = await crud.create_saved_search("python", "pune", ["linkedin", "careerjet"], 5, interval_minutes=30)
+    now = datetime.utcnow()
+
+    assert await crud.enqueue_due_searches(now) == 1
+    assert await crud.enqueue_due_searches(now) == 0
+    assert await crud.enqueue_due_searches(now + timedelta(minutes=31)) == 1
+
+    [saved] = await crud.list_saved_searches()
+    assert saved["next_run_at"] == now + timedelta(minutes=61)
+    tasks = await crud.claim_tasks(5)
+    assert [task["saved_search_id"] for task in tasks] == [search["id"], search["id"]]
+    assert tasks[0]["sources"] == ["linkedin", "careerjet"]
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_queued_scrapes_and_persists(monkeypatch, sqlite_sessions):
+    async def scraper(query, location, limit):
+        return [{"title": f"{query} {i}", "company": "Co", "location": location, "description": "",
+                 "url": f"https://example.com/{query}/{i}", "source": "Fake"} for i in range(limit)]
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"fake": scraper}, raising=True)
+    task = await crud.enqueue_scrape("python", "pune", ["fake"], 3)
+
+    # The test database is one shared connection, so nothing else may open a
+    # session while the task runs: wait for its outcome instead of polling, and
+    # poll slowly enough that the worker itself stays idle meanwhile
+    finished = asyncio.Event()
+
+    async def finish_task(*args, **kwargs):
+        await crud.finish_task(*args, **kwargs)
+        finished.set()
+
+    monkeypatch.setattr("app.worker.finish_task", finish_task)
+    stop = asyncio.Event()
+    app = types.SimpleNamespace(state=types.SimpleNamespace())
+    worker = asyncio.ensure_future(work(app, concurrency=2, poll_seconds=5, stop=stop))
+    await asyncio.wait_for(finished.wait(), timeout=5)
+    stop.set()
+    await worker
+
+    done = await crud.get_task(task["task_id"])
+    assert done["status"] == "done"
+    assert done["result"]["total_jobs"] == 3
+    assert done["result"]["persisted"]["inserted"] == 3
+    saved = await crud.get_saved_jobs(source="fake")
+    assert saved["pagination"]["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_a_failed_poll(monkeypatch, sqlite_sessions):
+    async def scraper(query, location, limit):
+        return [{"title": "Job", "company": "Co", "location": location, "description": "",
+                 "url": "https://example.com/job", "source": "Fake"}]
+
+    monkeypatch.setattr("app.scraper.SCRAPERS", {"fake": scraper}, raising=True)
+    task = await crud.enqueue_scrape("python", "pune", ["fake"], 1)
+
+    polls = []
+
+    async def flaky_enqueue_due_searches():
+        polls.append(1)
+        if len(polls) == 1:
+            raise ConnectionError("database restarting")
+        return await crud.enqueue_due_searches()
+
+    finished = asyncio.Event()
+
+    async def finish_task(*args, **kwargs):
+        await crud.finish_task(*args, **kwargs)
+        finished.set()
+
+    monkeypatch.setattr("app.worker.enqueue_due_searches", flaky_enqueue_due_searches)
+    monkeypatch.setattr("app.worker.finish_task", finish_task)
+    stop = asyncio.Event()
+    app = types.SimpleNamespace(state=types.SimpleNamespace())
+    worker = asyncio.ensure_future(work(app, poll_seconds=0.05, stop=stop))
+    await asyncio.wait_for(finished.wait(), timeout=5)
+    stop.set()
+    await worker
+
+    assert len(polls) >= 2
+    assert (await crud.get_task(task["task_id"]))["status"] == "done"
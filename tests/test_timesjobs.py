@@ -0,0 +1,69 @@
+import httpx
+import pytest
+
+from app.scraper import http as http_mod
+from app.scraper import timesjobs
+
+
+def _page(page: int, count: int) -> str:
+    cards = "".join(
+        f'<li class="clearfix job-bx"><h2><a href="/job-detail/{page}-{i}?jobid={page}{i}">Job {page}-{i}</a></h2>'
+        f'<h3 class="joblist-comp-name">Co {i} (More Jobs)</h3></li>'
+        for i in range(count)
+    )
+    return f"<html><body><ul>{cards}</ul></body></html>"
+
+
+@pytest.mark.asyncio
+async def test_scrape_timesjobs_keeps_page_order(monkeypatch):
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        if "curPg" in params or "txtLocation" not in params:
+            return httpx.Response(500)
+        page = int(params["sequence"])
+        requested.append(page)
+        return httpx.Response(200, text=_page(page, 4))
+
+    pool = http_mod.HostPool()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_mod, "_pool", pool)
+    try:
+        jobs = await timesjobs.scrape_timesjobs("python", "pune", limit=10, page_window=3)
+    finally:
+        await pool.aclose()
+
+    assert [j["title"] for j in jobs] == [f"Job {p}-{i}" for p in (1, 2, 3) for i in range(4)][:10]
+    assert jobs[0]["company"] == "Co 0"
+    assert 5 not in requested
+
+
+@pytest.mark.asyncio
+async def test_scrape_timesjobs_prefers_located_variant_over_faster_fallback(monkeypatch):
+    import asyncio
+
+    located_cards = 2
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        if "txtLocation" not in params:
+            return httpx.Response(200, text=_page(0, 4))
+        await asyncio.sleep(0.05)
+        if "curPg" in params:
+            return httpx.Response(500)
+        return httpx.Response(200, text=_page(int(params["sequence"]), located_cards))
+
+    pool = http_mod.HostPool()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_mod, "_pool", pool)
+    try:
+        jobs = await timesjobs.scrape_timesjobs("python", "pune", limit=2)
+        assert [j["title"] for j in jobs] == ["Job 1-0", "Job 1-1"]
+
+        # Located searches that find nothing fall back to the unfiltered one
+        located_cards = 0
+        jobs = await timesjobs.scrape_timesjobs("python", "pune", limit=2)
+        assert [j["title"] for j in jobs] == ["Job 0-0", "Job 0-1"]
+    finally:
+        await pool.aclose()
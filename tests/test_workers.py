@@ -0,0 +1,26 @@
+import types
+
+import pytest
+
+from app.scraper import linkedin, workers
+
+
+PAGE = (
+    b'<ul><li><div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:42">'
+    b'<a href="https://in.linkedin.com/jobs/view/42"></a>'
+    b'<h3 class="base-search-card__title">Python Developer</h3>'
+    b'<h4 class="base-search-card__subtitle">ACME</h4></div></li></ul>'
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["inline", "thread", "process"])
+async def test_run_parser_returns_same_tuples(kind):
+    app = types.SimpleNamespace(state=types.SimpleNamespace())
+    await workers.init_parse_pool(app, kind=kind, workers=1)
+    try:
+        rows = await workers.run_parser(linkedin._parse_cards, PAGE)
+    finally:
+        await workers.close_parse_pool(app)
+
+    assert rows == [("42", "Python Developer", "ACME", "Remote", "https://in.linkedin.com/jobs/view/42")]